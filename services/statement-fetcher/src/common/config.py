@@ -1,37 +1,181 @@
-import copy
 import dataclasses
+import functools
 import importlib.util
 import json
 import os
 import sys
+from collections.abc import Callable, Mapping
+from copy import deepcopy
 from typing import Any
 
 
-def _normalize_config(data: dict[str, Any]) -> dict[str, Any]:
+def _lower_keys(data: dict[str, Any]) -> dict[str, Any]:
+    """Recursively lowercase (and intern) the keys of an already parsed JSON object; objects inside lists are left as is"""
+    return {sys.intern(key.lower()): _lower_keys(value) if isinstance(value, dict) else value for key, value in data.items()}
+
+
+def _load_json(raw: bytes) -> Any:
+    return _lower_keys(json.loads(raw))
+
+
+# Parsed JSON config files (with lowercased keys) by absolute path, tagged with the (mtime_ns, size) they were read at.
+# Unchanged files are only decoded once, and a changed file replaces its stale entry instead of accumulating.
+_JSON_CACHE: dict[str, tuple[int, int, Any]] = {}
+
+
+def _normalize_config(data: dict[str, Any], keys_already_lower: bool = False) -> dict[str, Any]:
     """
-    Recursively convert all dictionary keys to lowercase and values to strings or None
+    Convert all dictionary keys to lowercase and values to strings or None
     Excludes callables (functions, lambdas, etc.) at any nesting level
+    Set `keys_already_lower` to skip lowercasing when the caller guarantees lowercase keys
+
+    Nested dictionaries are walked with an explicit stack instead of recursion,
+    and dictionaries that end up empty are pruned afterwards (children before parents).
     """
-    result = {}
-    for key, value in data.items():
-        key = key.lower()
+    if not data:
+        return {}
+
+    _callable = callable
+    _is_dataclass = dataclasses.is_dataclass
+    _asdict = dataclasses.asdict
+    _intern = sys.intern
+
+    root: dict[str, Any] = {}
+    # (source, target, parent, key): `target` is stored as `parent[key]`
+    stack: list[tuple[dict[str, Any], dict[str, Any], dict[str, Any] | None, str]] = [(data, root, None, "")]
+    visited: list[tuple[dict[str, Any], dict[str, Any] | None, str]] = []
+
+    while stack:
+        source, target, parent, parent_key = stack.pop()
+        visited.append((target, parent, parent_key))
+
+        for key, value in source.items():
+            if _callable(value):
+                continue
+
+            if _is_dataclass(value):
+                value = _asdict(value)
+
+            if not keys_already_lower:
+                key = _intern(key.lower())
+            if isinstance(value, dict):
+                if not value:
+                    # Empty sections are pruned anyway, don't allocate a child for them
+                    continue
+                if key in target:
+                    # Keys colliding after lowercasing (rare): like a recursive walk, the later section only
+                    # replaces the earlier value if it normalizes to something, so normalize it right away
+                    collided = _normalize_config(value, keys_already_lower)
+                    if collided:
+                        target[key] = collided
+                    continue
+                child: dict[str, Any] = {}
+                target[key] = child
+                stack.append((value, child, target, key))
+            elif value is None:
+                target[key] = None
+            else:
+                target[key] = str(value)
+
+    # Every child is visited after its parent, so walking backwards prunes bottom-up
+    for target, parent, parent_key in reversed(visited):
+        if not target and parent is not None and parent.get(parent_key) is target:
+            del parent[parent_key]
+
+    return root
+
+
+def _normalize_and_merge(target: dict[str, Any], source: dict[str, Any], keys_already_lower: bool = False) -> None:
+    """
+    Normalize `source` (see `_normalize_config`) and merge it into `target`
+
+    The source is normalized fully first, so keys that collide after lowercasing resolve within the source
+    (the last one wins) before anything reaches `target`. Nested dictionaries are then merged into existing
+    target dictionaries with an explicit stack; everything else is assigned as is. The normalized values are
+    fresh objects, so `target` never aliases data owned by the caller.
+    """
+    stack = [(target, _normalize_config(source, keys_already_lower))]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            existing = target.get(key)
+            if isinstance(value, dict) and isinstance(existing, dict):
+                stack.append((existing, value))
+            else:
+                target[key] = value
 
-        if callable(value):
+
+def _parse_env(environ: Mapping[str, str], prefix: str) -> dict[str, Any]:
+    """
+    Build the nested config tree of environment variables starting with `prefix` (lowercase), see `ConfigBuilder.with_env`
+    """
+    prefix_len = len(prefix)
+    config: dict[str, Any] = {}
+    for key, value in environ.items():
+        # Lowercase once; every path part below is already lowercase
+        key = key.lower()
+        if prefix:
+            if not key.startswith(prefix):
+                continue
+            key = key[prefix_len:]
+
+        # Most variables aren't nested: partition finds that in one scan without building a list
+        head, separator, rest = key.partition("__")
+        if not separator:
+            config[sys.intern(key)] = value
             continue
 
-        if dataclasses.is_dataclass(value):
-            value = dataclasses.asdict(value)
+        # Handle nested configuration with __ separator
+        parts = [sys.intern(head), *(sys.intern(part) for part in rest.split("__"))]
+        current = config
+        for part in parts[:-1]:
+            next_level = current.get(part)
+            if not isinstance(next_level, dict):
+                # Missing, or a non-dict value where we need a dict: replace it with an empty dict
+                next_level = current[part] = {}
+            current = next_level
 
-        if isinstance(value, dict):
-            normalized_dict = _normalize_config(value)
-            if normalized_dict:
-                result[key] = normalized_dict
-        elif value is None:
-            result[key] = None
-        else:
-            result[key] = str(value)
+        # Set the value at the leaf node
+        current[parts[-1]] = value
 
-    return result
+    return config
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_key(key: str) -> tuple[str, ...]:
+    """
+    Lowercase a dotted config key and split it into its interned path parts (cached)
+    """
+    return tuple(sys.intern(part) for part in key.lower().split("."))
+
+
+@functools.lru_cache(maxsize=4096)
+def _lower_key(key: str) -> str:
+    """
+    Lowercase and intern a single config key (cached)
+    """
+    return sys.intern(key.lower())
+
+
+# Marks a missing value where None is a legitimate config value
+_MISSING = object()
+
+# Boolean spellings accepted by Config.get_bool. common doesn't depend on the fetcher package,
+# so this mirrors the spellings of finchie_statement_fetcher.utils.type_utils.parse_bool_string; a test keeps them equal
+_BOOL_STRINGS = {
+    "true": True,
+    "yes": True,
+    "y": True,
+    "1": True,
+    "on": True,
+    "t": True,
+    "false": False,
+    "no": False,
+    "n": False,
+    "0": False,
+    "off": False,
+    "f": False,
+}
 
 
 class Config:
@@ -40,7 +184,7 @@ class Config:
     """
 
     # Define __slots__ to prevent adding attributes after initialization
-    __slots__ = ("_config",)
+    __slots__ = ("_config", "_sections")
 
     def __init__(self, config_data: dict[str, Any] | None = None, *, _skip_normalization: bool = False):
         """
@@ -57,45 +201,85 @@ class Config:
         else:
             self._config = _normalize_config(config_data)
 
+        # Wrap nested sections once so attribute/section access doesn't allocate per read
+        self._sections = {key: Config(value, _skip_normalization=True) for key, value in self._config.items() if isinstance(value, dict)}
+
     def get(self, key: str = "", default: Any = None) -> Any:
         if not key:
             return self._config
 
-        key = key.lower()
-        # Handle nested keys with dot notation
-        if "." in key:
-            parts = key.split(".")
-            current = self._config
-
-            # Navigate through nested dictionaries
-            for part in parts[:-1]:
-                if part not in current or not isinstance(current[part], dict):
-                    return default
-                current = current[part]
-
-            return current.get(parts[-1], default)
-        else:
-            return self._config.get(key, default)
+        if "." not in key:
+            # Stored keys are lowercase, so an already-lowercase key hits directly without lowering it
+            value = self._config.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            return self._config.get(_lower_key(key), default)
 
-    def get_section(self, section_key: str) -> "Config":
-        section_key = section_key.lower()
-        if section_key not in self._config:
-            return Config({})
+        parts = _split_key(key)
+
+        # Keys are stored lowercased, so each level is a single hash lookup
+        current = self._config
+        for part in parts[:-1]:
+            current = current.get(part)
+            if not isinstance(current, dict):
+                return default
+
+        return current.get(parts[-1], default)
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        """
+        Get a value as a boolean
+
+        Values are stored as strings, so common spellings are recognized case-insensitively:
+        true/yes/y/1/on/t and false/no/n/0/off/f. Anything else (including a missing key) returns `default`.
+        """
+        value = self.get(key)
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, (int, float)):
+            return bool(value)
+        if isinstance(value, str):
+            result = _BOOL_STRINGS.get(value.strip().lower())
+            if result is not None:
+                return result
+        return default
+
+    def compile_getter(self, key: str, default: Any = None) -> Callable[[], Any]:
+        """
+        Compile a getter specialized for a fixed key, for values read in hot loops
+
+        The returned callable behaves like `get(key, default)` on this Config, but the
+        key is parsed once and the lookup is generated as a chain of subscripts.
+
+        Example:
+            ```
+            get_output_dir = config.compile_getter("fetcher.output_dir", "data")
+            output_dir = get_output_dir()
+            ```
+        """
+        if not key:
+            config_data = self._config
+            return lambda: config_data
+
+        lookup = "".join(f"[{part!r}]" for part in _split_key(key))
+        source = f"def getter():\n    try:\n        return config{lookup}\n    except (KeyError, TypeError):\n        return default\n"
+        namespace = {"config": self._config, "default": default}
+        exec(source, namespace)
+        return namespace["getter"]
 
-        section_value = self._config[section_key]
-        if not isinstance(section_value, dict):
+    def get_section(self, section_key: str) -> "Config":
+        section = self._sections.get(_lower_key(section_key))
+        if section is None:
             return Config({})
 
-        return Config(section_value, _skip_normalization=True)
+        return section
 
     def __getattr__(self, name: str) -> Any:
-        name = name.lower()
-        if name not in self._config:
-            return None
-
-        if isinstance(self._config[name], dict):
-            return Config(self._config[name], _skip_normalization=True)
-        return self._config[name]
+        name = _lower_key(name)
+        section = self._sections.get(name)
+        if section is not None:
+            return section
+        return self._config.get(name)
 
     def __getitem__(self, key: str) -> Any:
         return self.get(key)
@@ -144,47 +328,36 @@ class Config:
 class ConfigBuilder:
     """
     Builder class for creating Config objects with case-insensitive keys
+
+    `build()` transfers ownership of the accumulated configuration to the returned
+    Config instead of copying it, and resets the builder to an empty state.
+    Pass `copy=True` to keep the builder's data intact (at the cost of a deep copy).
     """
 
     def __init__(self):
         self._config = {}
 
     def with_dict(self, config_data: dict[str, Any]) -> "ConfigBuilder":
-        normalized_config = _normalize_config(config_data)
-        self._deep_update(self._config, normalized_config)
+        _normalize_and_merge(self._config, config_data)
         return self
 
-    def with_env(self) -> "ConfigBuilder":
+    def with_env(self, prefix: str | None = None) -> "ConfigBuilder":
         """
         Add configuration from environment variables
         Uses double underscore (__) as a separator for nested config.
         Example: DATABASE__HOST will be converted to config.database.host
-        """
 
-        for key, value in os.environ.items():
-            # Convert key to lowercase
-            key = key.lower()
-
-            # Handle nested configuration with __ separator
-            if "__" in key:
-                parts = key.split("__")
-
-                current = self._config
-                for part in parts[:-1]:
-                    part = part.lower()
-                    if part not in current:
-                        current[part] = {}
-                    elif not isinstance(current[part], dict):
-                        # If we encounter a non-dict value when we need a dict,
-                        # overwrite it with an empty dict
-                        current[part] = {}
-                    current = current[part]
-
-                # Set the value at the leaf node
-                current[parts[-1].lower()] = value
-            else:
-                self._config[key] = value
+        Args:
+            prefix: Only variables starting with this prefix (case-insensitive) are used,
+                and the prefix is stripped from the key. Defaults to the FINCHIE_ENV_PREFIX
+                environment variable, or no filtering when it is not set.
+                Example: with prefix "FINCHIE__", FINCHIE__DATABASE__HOST becomes config.database.host
+        """
+        if prefix is None:
+            prefix = os.environ.get("FINCHIE_ENV_PREFIX", "")
+        prefix = prefix.lower()
 
+        _normalize_and_merge(self._config, _parse_env(os.environ, prefix), keys_already_lower=True)
         return self
 
     def with_py_file(self, file_path: str, optional: bool = False) -> "ConfigBuilder":
@@ -227,16 +400,9 @@ class ConfigBuilder:
             sys.modules[module_name] = module
             spec.loader.exec_module(module)  # type: ignore
 
-            # Extract uppercase variables as configuration
-            config_dict = {}
-            for key in dir(module):
-                # Skip internal/private attributes
-                if key.startswith("__"):
-                    continue
-
-                # Get only uppercase variables as config entries
-                if key.isupper():
-                    config_dict[key] = getattr(module, key)
+            # Extract uppercase variables as configuration, skipping internal/private attributes.
+            # Reading the module namespace directly avoids sorting dir() and a getattr per name.
+            config_dict = {key: value for key, value in vars(module).items() if key.isupper() and not key.startswith("__")}
 
             return self.with_dict(config_dict)
 
@@ -260,26 +426,45 @@ class ConfigBuilder:
             FileNotFoundError: If the file doesn't exist and optional is False
             ValueError: If there's an error parsing the JSON file
         """
-        if not os.path.exists(file_path):
+        # One stat both checks existence and keys the cache
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
             if optional:
                 return self
-            else:
-                raise FileNotFoundError(f"Configuration file not found: {file_path}")
+            raise FileNotFoundError(f"Configuration file not found: {file_path}") from None
 
-        try:
-            with open(file_path) as f:
-                config_data = json.load(f)
-                return self.with_dict(config_data)
-        except json.JSONDecodeError as err:
-            raise ValueError(f"Invalid JSON format in file: {file_path}") from err
-
-    @staticmethod
-    def _deep_update(target: dict[str, Any], source: dict[str, Any]) -> None:
-        for key, value in source.items():
-            if isinstance(value, dict) and key in target and isinstance(target[key], dict):
-                ConfigBuilder._deep_update(target[key], value)
-            else:
-                target[key] = value
+        cache_key = os.path.abspath(file_path)
+        cached = _JSON_CACHE.get(cache_key)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            config_data = cached[2]
+        else:
+            try:
+                # Unbuffered: the whole file is read in one call and handed to the parser as a single buffer
+                with open(file_path, "rb", buffering=0) as f:
+                    config_data = _load_json(f.read())
+            except json.JSONDecodeError as err:
+                raise ValueError(f"Invalid JSON format in file: {file_path}") from err
+            _JSON_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size, config_data)
+
+        # Keys were lowercased at parse time; merging copies into fresh dicts, so the cached data is never mutated
+        _normalize_and_merge(self._config, config_data, keys_already_lower=True)
+        return self
 
-    def build(self) -> Config:
-        return Config(copy.deepcopy(self._config), _skip_normalization=True)
+    def build(self, copy: bool = False) -> Config:
+        """
+        Build a Config from the accumulated configuration
+
+        Args:
+            copy: If True, deep copy the configuration and keep the builder reusable.
+                Otherwise the data is moved into the Config and the builder is reset.
+
+        Returns:
+            The built Config
+        """
+        if copy:
+            return Config(deepcopy(self._config), _skip_normalization=True)
+
+        config = Config(self._config, _skip_normalization=True)
+        self._config = {}
+        return config
@@ -1,23 +1,18 @@
 import os
 import runpy
 import sys
+from pathlib import Path
 
 
 def find_project_root(target_dir_name: str) -> str:
     """
-    Recursively searches for the root directory of a project by looking for a directory
+    Searches upwards from this file for the project root directory with the given name
     """
-    current_dir = os.path.abspath(os.path.dirname(__file__))
+    for parent in Path(__file__).resolve().parents:
+        if parent.name == target_dir_name:
+            return str(parent)
 
-    while True:
-        if os.path.basename(current_dir) == target_dir_name:
-            return current_dir
-
-        parent_dir = os.path.dirname(current_dir)
-        if parent_dir == current_dir:
-            raise FileNotFoundError(f"{target_dir_name} not found in the directory tree.")
-
-        current_dir = parent_dir
+    raise FileNotFoundError(f"{target_dir_name} not found in the directory tree.")
 
 
 if __name__ != "__main__":
@@ -1,36 +1,60 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 from datetime import datetime
 
 from common.config import Config
 from finchie_statement_fetcher.dispatcher import process
+from finchie_statement_fetcher.utils.logging_utils import disable_thread_and_process_info
 
-start_time = datetime.now()
+logger = logging.getLogger(__name__)
 
-# Setup logging configuration
-log_dir = os.path.join("data", "logs")
-os.makedirs(log_dir, exist_ok=True)
-log_file = os.path.join(log_dir, f"statement_fetcher_{datetime.now().strftime('%Y-%m-%d')}.log")
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(), logging.FileHandler(log_file)],
-)
 
-logger = logging.getLogger(__name__)
+def _setup_logging(now: datetime) -> None:
+    """Log to the console and to a daily file under data/logs, named after the date of `now`, via a background queue listener."""
+    # The format never shows thread or process info, so don't collect it for every record
+    disable_thread_and_process_info()
+
+    log_dir = os.path.join("data", "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    log_file = os.path.join(log_dir, f"statement_fetcher_{now.strftime('%Y-%m-%d')}.log")
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    handlers: list[logging.Handler] = [logging.StreamHandler(), logging.FileHandler(log_file, encoding="utf-8", delay=True)]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # Records are handed to a queue and written by a background listener, so logging never blocks on console or disk I/O
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
+    # The queue side only merges the message and arguments; the listener's handlers apply the full layout
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[logging.handlers.QueueHandler(log_queue)])
+
+
+def main() -> None:
+    start_time = datetime.now()
+
+    _setup_logging(start_time)
+
+    logger.info("Starting Finchie Statement Fetcher")
+
+    try:
+        config = Config.get_default_builder().build().get()
 
-logger.info("Starting Finchie Statement Fetcher")
+        logger.debug("Configuration loaded successfully")
 
-try:
-    config = Config.get_default_builder().build().get()
+        process(config)
 
-    logger.debug("Configuration loaded successfully")
+        elapsed_seconds = (datetime.now() - start_time).total_seconds()
 
-    process(config)
+        logger.info("Finchie Statement Fetcher completed successfully in %s seconds", elapsed_seconds)
+    except Exception as e:
+        logger.error("An error occurred during the Finchie Statement Fetcher execution: %s", str(e))
+        raise
 
-    elapsed_time = datetime.now() - start_time
 
-    logger.info("Finchie Statement Fetcher completed successfully in %s seconds", elapsed_time.total_seconds())
-except Exception as e:
-    logger.error("An error occurred during the Finchie Statement Fetcher execution: %s", str(e))
-    raise
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,55 @@
+import contextlib
+import functools
+import importlib
 import logging
+import numbers
 import os
+from collections.abc import Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
-from finchie_statement_fetcher.fetcher import fetch_gmail_messages
 from finchie_statement_fetcher.models import Statement
-from finchie_statement_fetcher.processor import BaseProcessor, TsibProcessor
-from finchie_statement_fetcher.storer import BaseStorer, LocalJsonStorer
-from finchie_statement_fetcher.utils.type_utils import to_bool
+from finchie_statement_fetcher.processor import BaseProcessor
+from finchie_statement_fetcher.storer import BaseStorer
+from finchie_statement_fetcher.utils.type_utils import parse_bool_string, to_int
 
 logger = logging.getLogger(__name__)
 
-# List of all available document extractors
-ALL_PROCESSORS: list[type[BaseProcessor]] = [
-    TsibProcessor,
-]
+# Registries below map a config name to the (module, attribute) that implements it.
+# Modules are only imported when first needed, so an unused source, processor or storer costs nothing at startup.
 
-# List of all available data storers
-ALL_STORERS: list[type[BaseStorer]] = [
-    LocalJsonStorer,
-]
+# Available document processors
+PROCESSOR_SPECS: dict[str, tuple[str, str]] = {
+    "tsib": ("finchie_statement_fetcher.processor.tsib", "TsibProcessor"),
+}
+
+# Available fetchers; each function yields batches of fetched folders (gmail pulls in the Google API client stack)
+FETCHER_SPECS: dict[str, tuple[str, str]] = {
+    "gmail": ("finchie_statement_fetcher.fetcher.gmail", "iter_gmail_messages"),
+}
+
+# Available data storers
+STORER_SPECS: dict[str, tuple[str, str]] = {
+    "local_json": ("finchie_statement_fetcher.storer.local_json_storer", "LocalJsonStorer"),
+}
+
+# Default maximum number of fetched folders processed concurrently (config: dispatcher.max_workers)
+_MAX_PROCESS_WORKERS = 8
 
 
 def process(config: Any) -> None:
-    fetch_result_dir_list = _fetch_data(config)
-    normalized_result = _process_fetched_dirs(config, fetch_result_dir_list)
+    # Resolve processors and their config sections once per run rather than per batch or folder
+    processors = _resolve_processors(config.get("document_processor", {}))
+    max_workers = to_int(config.get("dispatcher", {}).get("max_workers"), _MAX_PROCESS_WORKERS)[0]
+
+    # Each fetched batch is processed while the fetcher keeps downloading the next ones in the background;
+    # storers get every statement at once, so storing waits for the end.
+    # Closing the fetch generator on an error stops the downloads that haven't started.
+    normalized_result: list[Statement] = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor, contextlib.closing(_fetch_data(config)) as batches:
+        for fetch_result_dir_list in batches:
+            normalized_result += _process_fetched_dirs(processors, executor, fetch_result_dir_list)
     _store_data(config, normalized_result)
 
 
@@ -41,70 +66,129 @@ def _store_data(config: Any, statements: list[Statement]) -> None:
         if not isinstance(storer_config, dict):
             continue
 
-        if to_bool(storer_config.get("disable", False))[0]:
+        if _is_disabled(storer_config.get("disable")):
             logger.warning("Storer %s is disabled", storer_name)
             continue
 
-        # Find appropriate storer
-        for storer_cls in ALL_STORERS:
-            if storer_cls.config_name() == storer_name:
-                logger.debug("Using storer %s to store statements", storer_cls.__name__)
-                storer_cls.store(storer_config, statements)
-                break
-        else:
+        storer_spec = STORER_SPECS.get(storer_name)
+        if storer_spec is None:
             logger.warning("No storer found for configuration %s", storer_name)
+            continue
 
+        storer_cls: type[BaseStorer] = _load_class(*storer_spec)
+        logger.debug("Using storer %s to store statements", storer_cls.__name__)
+        storer_cls.store(storer_config, statements)
 
-def _fetch_data(config: Any) -> list[str]:
+
+def _is_disabled(value: Any) -> bool:
+    """
+    Check a "disable" flag without going through the full to_bool conversion.
+    Strings use the to_bool spellings; anything unrecognized leaves the source/storer enabled.
+    """
+    if value is True:
+        return True
+    if isinstance(value, str):
+        return parse_bool_string(value) is True
+    return isinstance(value, numbers.Number) and bool(value)
+
+
+def _fetch_data(config: Any) -> Iterator[list[str]]:
+    """Yield the fetched folders of every enabled source, one batch at a time"""
     fetcher_config = config.get("fetcher", {})
 
     output_dir = fetcher_config.get("output_dir", "data/fetched_result")
 
-    result: list[str] = []
-
-    for source in fetcher_config:
-        source_config = fetcher_config[source]
-        if not isinstance(source_config, dict):
+    for source, source_config in fetcher_config.items():
+        # output_dir is the shared default, not a source
+        if source == "output_dir" or not isinstance(source_config, dict):
             continue
 
-        if to_bool(source_config.get("disable", False))[0]:
+        if _is_disabled(source_config.get("disable")):
             logger.warning("Source %s is disabled", source)
             continue
         if not source_config.get("output_dir"):
             source_config["output_dir"] = os.path.join(output_dir, source)
 
-        match source:
-            case "gmail":
-                result += fetch_gmail_messages(source_config)
-
-    return result
+        fetcher_spec = FETCHER_SPECS.get(source)
+        if fetcher_spec is not None:
+            module_name, function_name = fetcher_spec
+            fetcher = getattr(importlib.import_module(module_name), function_name)
+            yield from fetcher(source_config)
 
 
-def _process_fetched_dirs(config: Any, source_result_dir_list: list[str]) -> list[Statement]:
-    document_config = config.get("document_processor", {})
+def _process_fetched_dirs(
+    processors: list[tuple[type[BaseProcessor], Any]], executor: Executor, source_result_dir_list: list[str]
+) -> list[Statement]:
+    existing = _existing_paths(source_result_dir_list)
 
-    result = []
-    for folder_path in source_result_dir_list:
-        folder_path = Path(folder_path)
-        if not folder_path.exists():
+    def process_folder(folder_path: str) -> Statement | None:
+        if folder_path not in existing:
             logger.warning("Folder %s does not exist", folder_path)
-            continue
-
-        document = _extract_document(document_config, folder_path)
-        if document:
-            result.append(document)
-
-    return result
-
-
-def _extract_document(config: Any, folder_path: Path) -> Statement | None:
+            return None
+        return _extract_document(processors, Path(folder_path))
+
+    # Folders are independent and extraction is mostly file I/O, so process them concurrently; results keep the input order
+    return [document for document in executor.map(process_folder, source_result_dir_list) if document]
+
+
+@functools.cache
+def _load_class(module_name: str, class_name: str) -> type:
+    """Import a registered processor or storer class on first use"""
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _list_file_names(folder_path: str | Path) -> frozenset[str]:
+    """List the names of the folder's top-level entries (empty if the folder can't be read)"""
+    try:
+        with os.scandir(folder_path) as entries:
+            return frozenset(entry.name for entry in entries)
+    except OSError:
+        return frozenset()
+
+
+def _existing_paths(paths: list[str]) -> set[str]:
+    """
+    Return the given paths that exist.
+    Fetched folders usually share a parent, so each parent is listed once instead of stat-ing every path.
+    A name the listing doesn't contain is still checked with os.path.exists: listings never include "." or "..",
+    and on case-insensitive filesystems the path may be spelled differently than the entry on disk.
+    """
+    by_parent: dict[str, list[tuple[str, str]]] = {}
+    existing = set()
+    for path in paths:
+        parent, name = os.path.split(path)
+        if name:
+            by_parent.setdefault(parent or os.curdir, []).append((path, name))
+        elif os.path.exists(path):
+            # Trailing separator: there is no entry name to look up in the parent
+            existing.add(path)
+
+    for parent, entries in by_parent.items():
+        names = _list_file_names(parent)
+        existing.update(path for path, name in entries if name in names or os.path.exists(path))
+    return existing
+
+
+def _resolve_processors(config: Any) -> list[tuple[type[BaseProcessor], Any]]:
+    """
+    Pair every registered processor class with its configuration section.
+    Processors named in the config come first, so folders usually match on the first probe;
+    the rest are kept as a fallback in registration order.
+    """
+    names = [name for name in config if name in PROCESSOR_SPECS]
+    names += [name for name in PROCESSOR_SPECS if name not in config]
+    return [(_load_class(*PROCESSOR_SPECS[name]), config.get(name, {})) for name in names]
+
+
+def _extract_document(processors: list[tuple[type[BaseProcessor], Any]], folder_path: Path) -> Statement | None:
     result = None
-    for processor_cls in ALL_PROCESSORS:
-        processor_config = config.get(processor_cls.config_name(), {})
-
-        if processor_cls.can_handle(processor_config, folder_path):
+    # List the folder once and share it with every processor's probe
+    file_names = _list_file_names(folder_path)
+    for processor_cls, processor_config in processors:
+        probe = processor_cls.probe(processor_config, folder_path, file_names)
+        if probe is not None:
             logger.debug("Using processor %s to process folder %s", processor_cls.__name__, folder_path)
-            result = processor_cls.extract(processor_config, folder_path)
+            result = processor_cls.extract(processor_config, probe)
             if result:
                 break
             else:
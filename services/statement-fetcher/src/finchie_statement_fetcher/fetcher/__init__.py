@@ -1,5 +1,6 @@
-from .gmail import fetch_gmail_messages
+from .gmail import fetch_gmail_messages, iter_gmail_messages
 
 __all__ = [
     "fetch_gmail_messages",
+    "iter_gmail_messages",
 ]
@@ -1,26 +1,57 @@
 import base64
+import contextlib
 import json
 import logging
 import os
 import os.path
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from google.auth.credentials import Credentials as CredentialsBase
-from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
 
 from finchie_statement_fetcher.utils.logging_utils import setup_console_logger
-from finchie_statement_fetcher.utils.type_utils import coerce_to_instance
+from finchie_statement_fetcher.utils.type_utils import coerce_to_instance, prewarm_coercers
 
 SCOPES = ["https://www.googleapis.com/auth/gmail.readonly"]  # Read-only permission, only reading emails
 
-
-@dataclass
+# Maximum number of calls per batch HTTP request; Gmail throttles batches larger than 50
+_BATCH_SIZE = 50
+# Maximum number of message batches processed concurrently
+_MAX_CONCURRENT_BATCHES = 4
+# Maximum number of messages of a batch written to disk concurrently
+_MAX_PERSIST_WORKERS = 8
+# Messages listed per page; the Gmail API caps maxResults at 500
+_LIST_PAGE_SIZE = 500
+# Partial response mask for listing: only the ids and the paging token are used
+_LIST_FIELDS = "messages/id,nextPageToken"
+# Upper bound on the reported attachment bytes fetched in one batch, which is held in memory whole
+_MAX_BATCH_ATTACHMENT_BYTES = 32 << 20
+# Buffer size for message files, so large payloads are written in a few syscalls
+_WRITE_BUFFER_SIZE = 1 << 20
+# Lowercased header name checked on attachment parts
+_CONTENT_DISPOSITION = "content-disposition"
+# Attachment MIME types that are never saved (e.g. S/MIME signatures)
+_SKIP_MIME_TYPES = frozenset({"application/x-pkcs7-signature", "application/pkcs7-signature"})
+
+# Credentials reused within the process, keyed by (base64_token, credentials_file, token_file)
+_CREDENTIALS_CACHE: dict[tuple[str | None, str, str], CredentialsBase] = {}
+# Serializes credential loading/refreshing so concurrent callers don't stampede the token endpoint
+_CREDENTIALS_LOCK = threading.Lock()
+# Cached credentials are refreshed once they are this close to expiring
+_CREDENTIALS_REFRESH_MARGIN = timedelta(minutes=5)
+# Last token JSON written per token file, to skip rewriting an unchanged token
+_SAVED_TOKENS: dict[str, str] = {}
+
+
+@dataclass(slots=True, frozen=True)
 class GmailConfig:
     base64_token: str | None = None
     credentials_file: str = "config/secret/gmail/credentials.json"
@@ -30,6 +61,9 @@ class GmailConfig:
     days_ago: int = 30
 
 
+prewarm_coercers(GmailConfig)
+
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,7 +75,57 @@ class GmailFetcherError(Exception):
 
 def _get_credentials(config: GmailConfig) -> CredentialsBase | None:
     """
-    Get Gmail API credentials.
+    Get Gmail API credentials, reusing the ones already loaded in this process while they stay fresh.
+    See `_load_credentials` for how credentials are obtained.
+    """
+    key = (config.base64_token, config.credentials_file, config.token_file)
+    with _CREDENTIALS_LOCK:
+        creds = _CREDENTIALS_CACHE.get(key)
+        if creds is not None:
+            if _is_fresh(creds):
+                return creds
+            if creds.refresh_token:
+                _refresh(creds)
+                logger.info("Cached credentials refreshed")
+                _save_token(config.token_file, creds.to_json())
+                return creds
+
+        creds = _load_credentials(config)
+        if creds:
+            _CREDENTIALS_CACHE[key] = creds
+        return creds
+
+
+def _refresh(creds: CredentialsBase) -> None:
+    """Refresh the credentials; the requests transport is imported only when a refresh is needed."""
+    from google.auth.transport.requests import Request
+
+    creds.refresh(Request())
+
+
+def _is_fresh(creds: CredentialsBase) -> bool:
+    """Whether the credentials are valid and not about to expire."""
+    if not creds.valid:
+        return False
+    # google-auth keeps expiry as a naive UTC datetime
+    return creds.expiry is None or creds.expiry - datetime.now(UTC).replace(tzinfo=None) > _CREDENTIALS_REFRESH_MARGIN
+
+
+def _save_token(token_file: str, token_json: str) -> None:
+    """Write the token JSON to file, unless this exact token was already written."""
+    if _SAVED_TOKENS.get(token_file) == token_json:
+        return
+
+    os.makedirs(os.path.dirname(token_file), exist_ok=True)
+    with open(token_file, "w") as f:
+        f.write(token_json)
+    _SAVED_TOKENS[token_file] = token_json
+    logger.debug("Credentials saved to file: %s", token_file)
+
+
+def _load_credentials(config: GmailConfig) -> CredentialsBase | None:
+    """
+    Load Gmail API credentials.
     First try to read from token in config, if failed then read from file.
 
     The token in config is expected to be a base64 encoded JSON string.
@@ -49,8 +133,8 @@ def _get_credentials(config: GmailConfig) -> CredentialsBase | None:
     creds = None
     if config.base64_token:
         try:
-            decoded_bytes = base64.b64decode(config.base64_token)
-            token_json = json.loads(decoded_bytes.decode("utf-8"))
+            # json.loads takes the decoded UTF-8 bytes directly
+            token_json = json.loads(base64.b64decode(config.base64_token))
             creds = Credentials.from_authorized_user_info(token_json, SCOPES)
             if creds.valid:
                 logger.info("Credentials loaded from base64 encoded token")
@@ -66,113 +150,222 @@ def _get_credentials(config: GmailConfig) -> CredentialsBase | None:
 
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
+            _refresh(creds)
             logger.info("Credentials refreshed")
         else:
+            # Only needed for the interactive flow; pulls in requests_oauthlib
+            from google_auth_oauthlib.flow import InstalledAppFlow
+
             flow = InstalledAppFlow.from_client_secrets_file(config.credentials_file, SCOPES)
             creds = flow.run_local_server(port=0)
             logger.debug("Credentials obtained from user authentication")
 
-        os.makedirs(os.path.dirname(config.token_file), exist_ok=True)
-        with open(config.token_file, "w") as token_file:
-            token_file.write(creds.to_json())
-            logger.debug("Credentials saved to file: %s", config.token_file)
+        _save_token(config.token_file, creds.to_json())
     return creds
 
 
-def _save_message_data(service: Any, msg_id: str, msg_dir: str) -> None:
+def _fetch_messages(service: Any, msg_ids: list[str], http: Any = None) -> dict[str, dict[str, Any]]:
     """
-    Get email details, content and attachments, and save to the specified directory.
+    Fetch full email messages through batched HTTP requests, keyed by message id.
+    Sends at most _BATCH_SIZE `messages.get` calls per round trip.
     """
-    msg = service.users().messages().get(userId="me", id=msg_id, format="full").execute()
+    messages: dict[str, dict[str, Any]] = {}
+    errors: list[Exception] = []
 
-    with open(os.path.join(msg_dir, "message.json"), "w", encoding="utf-8") as f:
-        json.dump(msg, f, indent=4, ensure_ascii=False)
+    def on_message(request_id: str, response: dict[str, Any], exception: Exception | None) -> None:
+        if exception is not None:
+            errors.append(exception)
+        else:
+            messages[request_id] = response
 
-    payload = msg["payload"]
-    if "parts" in payload:
-        parts = payload["parts"]
-        _save_message_parts(service, msg_id, msg_dir, parts)
-    elif "body" in payload:
-        _save_message_body(payload["body"], msg_dir)
+    for start in range(0, len(msg_ids), _BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=on_message)
+        for msg_id in msg_ids[start : start + _BATCH_SIZE]:
+            batch.add(service.users().messages().get(userId="me", id=msg_id, format="full"), request_id=msg_id)
+        batch.execute(http=http)
 
+    if errors:
+        raise errors[0]
+    return messages
 
-def _save_message_parts(service: Any, msg_id: str, msg_dir: str, parts: list[dict[str, Any]]) -> None:
-    """Recursively process email parts (including embedded HTML, plain text)."""
-    for part in parts:
-        _save_message_body(part, msg_dir)
-        _save_attachment(service, msg_id, part, msg_dir)
-        if "parts" in part:
-            _save_message_parts(service, msg_id, msg_dir, part["parts"])
 
+def _save_message_data(msg: dict[str, Any], msg_dir: str) -> list[tuple[str, str, int]]:
+    """
+    Save email details and content to the specified directory.
 
-def _save_message_body(part: dict[str, Any], msg_dir: str) -> None:
-    """Save the email body content."""
-    if "body" not in part:
-        return
+    Returns:
+        (attachment_id, file_name, size) of the attachments to download into the directory
+    """
+    with open(os.path.join(msg_dir, "message.json"), "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+        f.write(json.dumps(msg, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
 
-    body = part["body"]
-    mime_type = part.get("mimeType")
+    return _save_message_parts(msg["payload"], msg_dir)
 
-    if "data" not in body:
-        return
-    data = base64.urlsafe_b64decode(body["data"].encode("UTF-8"))
+
+def _save_message_parts(payload: dict[str, Any], msg_dir: str) -> list[tuple[str, str, int]]:
+    """
+    Walk the MIME tree of a message in document order, saving inline bodies and collecting attachments.
+
+    Returns:
+        (attachment_id, file_name, size) of the attachments to download
+    """
+    attachments: list[tuple[str, str, int]] = []
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        body = part.get("body") or {}
+        if "data" in body:
+            _save_message_body(part.get("mimeType"), body["data"], msg_dir)
+        else:
+            attachment = _get_attachment(part)
+            if attachment:
+                attachments.append(attachment)
+        if "parts" in part:
+            stack.extend(reversed(part["parts"]))
+    return attachments
+
+
+def _save_message_body(mime_type: str | None, data: str, msg_dir: str) -> None:
+    """
+    Save the base64 encoded email body content.
+    The body is decoded once; text bodies that are not valid UTF-8 keep replacement characters instead of failing the fetch.
+    """
+    raw = base64.urlsafe_b64decode(data)
     if mime_type == "text/html":
-        with open(os.path.join(msg_dir, "body.html"), "w", encoding="utf-8") as f:
-            f.write(data.decode("utf-8"))
+        with open(os.path.join(msg_dir, "body.html"), "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(raw.decode("utf-8", errors="replace"))
     elif mime_type == "text/plain" or mime_type is None:
-        with open(os.path.join(msg_dir, "body.txt"), "w", encoding="utf-8") as f:
-            f.write(data.decode("utf-8"))
+        with open(os.path.join(msg_dir, "body.txt"), "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(raw.decode("utf-8", errors="replace"))
     else:
         logger.warning("Unknown MIME type %s, saving as raw data.", mime_type)
-        with open(os.path.join(msg_dir, "body_raw"), "wb") as f:
-            f.write(data)
+        with open(os.path.join(msg_dir, "body_raw"), "wb", buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(raw)
 
 
-def _save_attachment(service: Any, msg_id: str, part: dict[str, Any], msg_dir: str) -> None:
-    """Save email attachments."""
+def _get_attachment(part: dict[str, Any]) -> tuple[str, str, int] | None:
+    """Return (attachment_id, file_name, size) if the part is an attachment that should be saved."""
     file_name = part.get("filename")
     if not file_name:
-        return
+        return None
 
     file_name = os.path.basename(file_name)
     if not file_name:
-        return
+        return None
 
     mime_type = part.get("mimeType")
-    if mime_type in ["application/x-pkcs7-signature", "application/pkcs7-signature"]:
+    if mime_type in _SKIP_MIME_TYPES:
         logger.debug("Skipping attachment '%s' with MIME type '%s'", file_name, mime_type)
-        return
+        return None
 
     body = part.get("body", {})
     if "attachmentId" not in body:
         logger.warning("Attachment '%s' does not have attachmentId.", file_name)
-        return
+        return None
 
-    attachment_id = body["attachmentId"]
+    if body.get("size", 1) == 0:
+        logger.debug("Skipping empty attachment '%s'", file_name)
+        return None
 
-    headers = part.get("headers", [])
-    content_disposition = _get_header(headers, "Content-Disposition")
+    headers = _header_map(part.get("headers", []))
+    content_disposition = headers.get(_CONTENT_DISPOSITION, "")
     if "attachment" not in content_disposition.lower():
         logger.debug("Skipping attachment '%s' with Content Disposition is '%s'", file_name, content_disposition)
-        return
+        return None
 
-    try:
-        file_data = service.users().messages().attachments().get(userId="me", messageId=msg_id, id=attachment_id).execute()
-        raw = base64.urlsafe_b64decode(file_data["data"].encode("UTF-8"))
-        file_path = os.path.join(msg_dir, file_name)
-        with open(file_path, "wb") as f:
+    return body["attachmentId"], file_name, body.get("size", 0)
+
+
+def _save_attachments(service: Any, downloads: list[tuple[str, str, str, int]], http: Any = None) -> None:
+    """
+    Download email attachments through batched HTTP requests and save them.
+    A batch response is held in memory whole, so batches are also capped by the attachments' reported size.
+
+    Args:
+        downloads: (msg_id, attachment_id, file_path, size) for every attachment to save
+    """
+
+    def on_attachment(request_id: str, response: dict[str, Any], exception: Exception | None) -> None:
+        file_path = downloads[int(request_id)][2]
+        if exception is not None:
+            logger.error("Error downloading attachment '%s': %s", os.path.basename(file_path), exception)
+            return
+
+        raw = base64.urlsafe_b64decode(response["data"])
+        with open(file_path, "wb", buffering=_WRITE_BUFFER_SIZE) as f:
             f.write(raw)
-        logger.debug("Attachment '%s' saved to %s", part["filename"], file_path)
-    except HttpError as error:
-        logger.error("Error downloading attachment '%s': %s", part["filename"], error)
+        logger.debug("Attachment '%s' saved to %s", os.path.basename(file_path), file_path)
+
+    batch = None
+    batch_count = batch_bytes = 0
+    for index, (msg_id, attachment_id, _, size) in enumerate(downloads):
+        if batch is not None and (batch_count == _BATCH_SIZE or batch_bytes + size > _MAX_BATCH_ATTACHMENT_BYTES):
+            batch.execute(http=http)
+            batch = None
+        if batch is None:
+            batch = service.new_batch_http_request(callback=on_attachment)
+            batch_count = batch_bytes = 0
+        request = service.users().messages().attachments().get(userId="me", messageId=msg_id, id=attachment_id)
+        batch.add(request, request_id=str(index))
+        batch_count += 1
+        batch_bytes += size
+    if batch is not None:
+        batch.execute(http=http)
+
+
+def _save_message_batch(service: Any, creds: CredentialsBase, msg_ids: list[str], base_dir: str) -> list[str]:
+    """
+    Fetch a batch of messages and save them, with their attachments, under base_dir.
+
+    Runs on a worker thread, so it uses its own authorized Http: httplib2 is not thread-safe.
+    build_http gives it the same socket timeout and redirect handling as the Http that build() creates.
+
+    Returns:
+        List[str]: Paths of the saved message folders, in msg_ids order.
+    """
+    http = AuthorizedHttp(creds, http=build_http())
+    fetched = _fetch_messages(service, msg_ids, http)
+
+    def persist(msg_id: str) -> list[tuple[str, str, str, int]]:
+        logger.debug("Processing message: %s", msg_id)
+        msg_dir = f"{base_dir}{os.sep}{msg_id}"
+        # base_dir is created before any batch is submitted
+        with contextlib.suppress(FileExistsError):
+            os.mkdir(msg_dir)
+        logger.debug("Message directory created: %s", msg_dir)
 
+        attachments = _save_message_data(fetched[msg_id], msg_dir)
+        return [(msg_id, attachment_id, os.path.join(msg_dir, file_name), size) for attachment_id, file_name, size in attachments]
 
-def _get_header(headers: list[dict[str, str]], name: str) -> str:
-    for h in headers:
-        if h.get("name", "").lower() == name.lower():
-            return h.get("value", "")
-    return ""
+    # Saving is dominated by mkdir/open/write syscalls, so messages are written concurrently
+    downloads: list[tuple[str, str, str, int]] = []
+    with ThreadPoolExecutor(max_workers=min(_MAX_PERSIST_WORKERS, len(msg_ids))) as executor:
+        for message_downloads in executor.map(persist, msg_ids):
+            downloads.extend(message_downloads)
+
+    _save_attachments(service, downloads, http)
+    return [f"{base_dir}{os.sep}{msg_id}" for msg_id in msg_ids]
+
+
+def _list_message_ids(service: Any, search_query: str) -> Iterator[list[str]]:
+    """Yield the ids of the messages matching the query, one listing page at a time."""
+    messages_api = service.users().messages()
+    page_token = None
+    while True:
+        request = messages_api.list(userId="me", q=search_query, pageToken=page_token, maxResults=_LIST_PAGE_SIZE, fields=_LIST_FIELDS)
+        results = request.execute()
+        yield [message["id"] for message in results.get("messages", [])]
+        page_token = results.get("nextPageToken")
+        if not page_token:
+            return
+
+
+def _header_map(headers: list[dict[str, str]]) -> dict[str, str]:
+    """
+    Index headers by lowercased name, so several headers of a part can be read with one pass over them.
+    Repeated headers keep their first value, like a linear scan would.
+    """
+    return {h.get("name", "").lower(): h.get("value", "") for h in reversed(headers)}
 
 
 def fetch_gmail_messages(config: GmailConfig | dict | None = None) -> list[str]:
@@ -191,6 +384,14 @@ def fetch_gmail_messages(config: GmailConfig | dict | None = None) -> list[str]:
         IOError: When file read/write operations fail.
         Other exceptions that might occur during processing will be propagated.
     """
+    return [folder for folders in iter_gmail_messages(config) for folder in folders]
+
+
+def iter_gmail_messages(config: GmailConfig | dict | None = None) -> Iterator[list[str]]:
+    """
+    Like fetch_gmail_messages, but yield the message folders one batch at a time, in listing order.
+    Later batches keep downloading on worker threads while the caller handles the folders it already got.
+    """
     config = coerce_to_instance(config, GmailConfig) or GmailConfig()
 
     base_query = config.query
@@ -215,28 +416,38 @@ def fetch_gmail_messages(config: GmailConfig | dict | None = None) -> list[str]:
     service = build("gmail", "v1", credentials=creds)
     logger.debug("Gmail API service initialized.")
 
-    results = service.users().messages().list(userId="me", q=search_query).execute()
-    messages = results.get("messages", [])
-    logger.debug("Found %d messages.", len(messages))
-
-    if not messages:
-        logger.info("No messages found with the specified criteria.")
-        return []
-
     tstamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    message_folders = []
+    base_dir = os.path.join(config.output_dir, tstamp)
 
-    for message in messages:
-        logger.debug("Processing message: %s", message["id"])
-        msg_dir = os.path.join(config.output_dir, tstamp, message["id"])
-        os.makedirs(msg_dir, exist_ok=True)
-        logger.debug("Message directory created: %s", msg_dir)
-
-        _save_message_data(service, message["id"], msg_dir)
-        message_folders.append(msg_dir)
+    # Batches are independent, so they run on worker threads while the next listing page is fetched;
+    # results are handed out in listing order
+    message_count = 0
+    futures = []
+    executor = ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_BATCHES)
+    try:
+        for msg_ids in _list_message_ids(service, search_query):
+            if msg_ids and not message_count:
+                os.makedirs(base_dir, exist_ok=True)
+            message_count += len(msg_ids)
+            for start in range(0, len(msg_ids), _BATCH_SIZE):
+                futures.append(executor.submit(_save_message_batch, service, creds, msg_ids[start : start + _BATCH_SIZE], base_dir))
+
+        logger.debug("Found %d messages.", message_count)
+        for future in futures:
+            yield future.result()
+    except BaseException:
+        # A failed batch, or a caller that stopped early (GeneratorExit): drop the batches that haven't started
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        # Wait for the batches already running, so nothing is still writing once this returns or raises
+        executor.shutdown()
+
+    if not message_count:
+        logger.info("No messages found with the specified criteria.")
+        return
 
-    logger.info("Successfully processed %d messages", len(messages))
-    return message_folders
+    logger.info("Successfully processed %d messages", message_count)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -1,7 +1,18 @@
-from .base import BaseProcessor
-from .tsib import TsibProcessor
+from typing import Any
+
+from .base import BaseProcessor, ProbeResult
 
 __all__ = [
     "BaseProcessor",
+    "ProbeResult",
     "TsibProcessor",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # Concrete processors are imported on first access, so using the base classes doesn't load them
+    if name == "TsibProcessor":
+        from .tsib import TsibProcessor
+
+        return TsibProcessor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,22 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 from finchie_statement_fetcher.models import Statement
 
 
+@dataclass
+class ProbeResult:
+    """
+    Findings of a successful probe, handed to `extract` so the folder isn't inspected twice
+    """
+
+    folder_path: Path
+    file_paths: list[str] = field(default_factory=list)
+    """Paths of the files the processor will extract from, e.g. statement PDFs"""
+
+
 class BaseProcessor(ABC):
     @classmethod
     @abstractmethod
@@ -16,16 +28,21 @@ class BaseProcessor(ABC):
 
     @classmethod
     @abstractmethod
-    def can_handle(cls, config: Any, folder_path: Path) -> bool:
+    def probe(cls, config: Any, folder_path: Path, file_names: frozenset[str]) -> ProbeResult | None:
         """
         Determines whether this extractor can process the given folder
         e.g., based on file names, sender information, PDF names, etc.
+
+        `file_names` holds the names of the folder's top-level entries, listed once
+        per folder by the dispatcher so extractors don't have to hit the filesystem.
+
+        Returns the discovered files for `extract`, or None if the folder can't be handled
         """
         pass
 
     @classmethod
     @abstractmethod
-    def extract(cls, config: Any, folder_path: Path) -> Statement | None:
+    def extract(cls, config: Any, probe: ProbeResult) -> Statement | None:
         """
         Extracts all statement data and converts it to the Common format
         """
@@ -1,7 +1,9 @@
+import fnmatch
 import getpass
 import glob
 import logging
 import os
+import re
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -9,14 +11,17 @@ from typing import Any
 
 from finchie_statement_fetcher.models import Statement
 from finchie_statement_fetcher.models.api_models import SourceType, StatementType, Transaction
-from finchie_statement_fetcher.processor.base import BaseProcessor
-from finchie_statement_fetcher.processor.tsib_estatement_extractor import extract_credit_card_statement
+from finchie_statement_fetcher.processor.base import BaseProcessor, ProbeResult
 from finchie_statement_fetcher.utils import parse_taiwanese_date
 from finchie_statement_fetcher.utils.logging_utils import setup_console_logger
 from finchie_statement_fetcher.utils.type_utils import to_float
 
 logger = logging.getLogger(__name__)
 
+# Statement attachment file name pattern, translated to a regex once at import
+_STATEMENT_FILE_PATTERN = "TSB_Creditcard_Estatement*.pdf"
+_STATEMENT_FILE_RE = re.compile(fnmatch.translate(_STATEMENT_FILE_PATTERN))
+
 
 class TsibProcessor(BaseProcessor):
     @classmethod
@@ -24,14 +29,17 @@ class TsibProcessor(BaseProcessor):
         return "tsib"
 
     @classmethod
-    def can_handle(cls, config: Any, folder_path: Path) -> bool:
-        return _is_tsib_main_folder(folder_path)
+    def probe(cls, config: Any, folder_path: Path, file_names: frozenset[str]) -> ProbeResult | None:
+        # find TSB_Creditcard_Estatement*.pdf files in the folder_path
+        pdf_names = sorted(name for name in file_names if _STATEMENT_FILE_RE.match(name))
+        if not pdf_names:
+            return None
+
+        return ProbeResult(folder_path=folder_path, file_paths=[os.path.join(folder_path, name) for name in pdf_names])
 
     @classmethod
-    def extract(cls, config: Any, folder_path: Path) -> Statement | None:
-        # find TSB_Creditcard_Estatement*.pdf files in the folder_path
-        search_pattern = os.path.join(folder_path, "TSB_Creditcard_Estatement*.pdf")
-        matching_files = glob.glob(search_pattern, recursive=True)
+    def extract(cls, config: Any, probe: ProbeResult) -> Statement | None:
+        matching_files = probe.file_paths
         if not matching_files:
             logger.warning("No Taishin Bank credit card statement files found")
             return None
@@ -39,6 +47,9 @@ class TsibProcessor(BaseProcessor):
         if len(matching_files) > 1:
             logger.warning("Multiple Taishin Bank credit card statement files found, using the last one")
 
+        # Imported lazily so pdfplumber is only loaded when a statement is actually parsed
+        from finchie_statement_fetcher.processor.tsib_estatement_extractor import extract_credit_card_statement
+
         pdf_path = matching_files[-1]
         password = config.get("estatement_password", None)
 
@@ -76,18 +87,11 @@ class TsibProcessor(BaseProcessor):
         )
 
 
-def _is_tsib_main_folder(folder_path):
-    # Check if the folder contains the expected TSB_Creditcard_Estatement*.pdf files
-    search_pattern = os.path.join(folder_path, "TSB_Creditcard_Estatement*.pdf")
-    matching_files = glob.glob(search_pattern, recursive=True)
-    return len(matching_files) > 0
-
-
 if __name__ == "__main__":  # pragma: no cover
     setup_console_logger(logger)
 
     # Search for TSB_Creditcard_Estatement files in all subdirectories under data\fetched_result\gmail
-    search_pattern = os.path.join("data", "fetched_result", "gmail", "**", "TSB_Creditcard_Estatement*.pdf")
+    search_pattern = os.path.join("data", "fetched_result", "gmail", "**", _STATEMENT_FILE_PATTERN)
     matching_files = glob.glob(search_pattern, recursive=True)
 
     if not matching_files:
@@ -103,7 +107,7 @@ if __name__ == "__main__":  # pragma: no cover
         config={
             "estatement_password": password,
         },
-        folder_path=Path(pdf_path).parent,
+        probe=ProbeResult(folder_path=Path(pdf_path).parent, file_paths=[pdf_path]),
     )
 
     print(statement)
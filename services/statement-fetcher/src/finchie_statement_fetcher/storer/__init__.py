@@ -1,8 +1,18 @@
+from typing import Any
+
 # Import all storers for easy access
 from .base_storer import BaseStorer
-from .local_json_storer import LocalJsonStorer
 
 __all__ = [
     "BaseStorer",
     "LocalJsonStorer",
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    # Concrete storers are imported on first access, so using the base class doesn't load them
+    if name == "LocalJsonStorer":
+        from .local_json_storer import LocalJsonStorer
+
+        return LocalJsonStorer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
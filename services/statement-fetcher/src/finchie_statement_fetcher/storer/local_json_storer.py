@@ -48,8 +48,10 @@ class LocalJsonStorer(BaseStorer):
             filepath = os.path.join(output_dir, filename)
 
             try:
+                # Encode to one string first: json.dump would issue a write call per encoder chunk
+                content = json.dumps(asdict(statement), cls=JsonEncoder, indent=2, ensure_ascii=False)
                 with open(filepath, "w", encoding="utf-8") as f:
-                    json.dump(asdict(statement), f, cls=JsonEncoder, indent=2, ensure_ascii=False)
+                    f.write(content)
                 logger.info("Saved statement to %s", filepath)
                 saved_count += 1
             except Exception as e:
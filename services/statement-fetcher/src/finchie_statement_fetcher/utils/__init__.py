@@ -2,6 +2,7 @@ from .date_utils import parse_taiwanese_date
 from .logging_utils import setup_console_logger
 from .type_utils import (
     coerce_to_instance,
+    parse_bool_string,
     to_bool,
     to_float,
     to_int,
@@ -11,6 +12,7 @@ from .type_utils import (
 
 __all__ = [
     "coerce_to_instance",
+    "parse_bool_string",
     "parse_taiwanese_date",
     "setup_console_logger",
     "to_bool",
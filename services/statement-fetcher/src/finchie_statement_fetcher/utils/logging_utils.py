@@ -1,6 +1,9 @@
 import logging
 import sys
 
+# Shared by every console handler; formatters hold no per-handler state
+_CONSOLE_FORMATTER = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
 
 def setup_console_logger(logger: logging.Logger) -> None:
     """
@@ -11,6 +14,15 @@ def setup_console_logger(logger: logging.Logger) -> None:
     """
     logger.setLevel(logging.DEBUG)
     handler = logging.StreamHandler(sys.stdout)
-    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-    handler.setFormatter(formatter)
+    handler.setFormatter(_CONSOLE_FORMATTER)
     logger.addHandler(handler)
+
+
+def disable_thread_and_process_info() -> None:
+    """
+    Stop collecting thread and process info on every log record, process-wide.
+    Only for the application entry point, and only while no log format shows that info.
+    """
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
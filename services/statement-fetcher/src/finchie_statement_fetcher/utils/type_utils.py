@@ -1,10 +1,15 @@
+import functools
 import numbers
-from inspect import signature
+from collections.abc import Callable
+from inspect import Parameter, signature
 from types import UnionType
 from typing import Any, TypeVar, get_args, get_origin, get_type_hints
 
 T = TypeVar("T")
 
+# Marks a value that is absent, where None is a legitimate value
+_MISSING = object()
+
 
 def get_value(obj: Any, key: str, default: T | None = None, required: bool = False) -> Any | T:
     """Get value from an object by key, with type safety"""
@@ -13,12 +18,14 @@ def get_value(obj: Any, key: str, default: T | None = None, required: bool = Fal
             raise ValueError(f"Required key '{key}' not found in None object")
         return default
 
-    if isinstance(obj, dict):
+    # Exact type checks first: a pointer comparison is cheaper than isinstance for the common plain dict
+    if type(obj) is dict or isinstance(obj, dict):
         if key in obj:
             return obj[key]
     else:
-        if hasattr(obj, key):
-            return getattr(obj, key)
+        value = getattr(obj, key, _MISSING)
+        if value is not _MISSING:
+            return value
 
     if required:
         raise ValueError(f"Required key '{key}' not found in object")
@@ -37,6 +44,23 @@ def to_string(value: Any, default: str = "") -> tuple[str, bool]:
     return str(value), True
 
 
+# Recognized boolean spellings, so one lookup tells true, false and unknown apart
+_BOOL_STRINGS = {
+    "true": True,
+    "yes": True,
+    "y": True,
+    "1": True,
+    "on": True,
+    "t": True,
+    "false": False,
+    "no": False,
+    "n": False,
+    "0": False,
+    "off": False,
+    "f": False,
+}
+
+
 def to_bool(value: Any, default: bool = False) -> tuple[bool, bool]:
     """Convert any value to boolean
 
@@ -44,29 +68,37 @@ def to_bool(value: Any, default: bool = False) -> tuple[bool, bool]:
         - (converted_value, True) if value can be converted clearly
         - (default, False) if value is unclear or invalid
 
-    True values: 'true', 'yes', 'y', '1', 1, True
+    True values: 'true', 'yes', 'y', '1', 'on', 't', 1, True
 
-    False values: 'false', 'no', 'n', '0', 0, False
+    False values: 'false', 'no', 'n', '0', 'off', 'f', 0, False
     """
     if value is None:
         return default, False
 
-    if isinstance(value, bool):
+    if type(value) is bool:
         return value, True
 
     if isinstance(value, numbers.Number):
         return bool(value), True
 
     if isinstance(value, str):
-        value = value.lower().strip()
-        if value in ("true", "yes", "y", "1"):
-            return True, True
-        if value in ("false", "no", "n", "0"):
-            return False, True
+        result = parse_bool_string(value)
+        if result is not None:
+            return result, True
 
     return default, False
 
 
+def parse_bool_string(value: str) -> bool | None:
+    """Parse a boolean spelling (see to_bool), ignoring case and surrounding whitespace; None if it isn't one"""
+    value = value.strip()
+    # Config values are usually lowercase already, so only lowercase when the exact spelling misses
+    result = _BOOL_STRINGS.get(value)
+    if result is None:
+        result = _BOOL_STRINGS.get(value.lower())
+    return result
+
+
 def to_int(value: Any, default: int = 0) -> tuple[int, bool]:
     """Convert any value to integer
 
@@ -77,10 +109,18 @@ def to_int(value: Any, default: int = 0) -> tuple[int, bool]:
     if value is None:
         return default, False
 
+    value_type = type(value)
+    if value_type is int:
+        return value, True
+
+    # bool is an int subclass; return a plain int rather than passing True/False through
+    if value_type is bool:
+        return int(value), True
+
     if isinstance(value, int):
         return value, True
 
-    if isinstance(value, float):
+    if value_type is float or isinstance(value, float):
         return int(value), True
 
     if isinstance(value, str):
@@ -102,7 +142,8 @@ def to_float(value: Any, default: float = 0.0) -> tuple[float, bool]:
     if value is None:
         return default, False
 
-    if isinstance(value, int | float):
+    value_type = type(value)
+    if value_type is float or value_type is int or isinstance(value, (int, float)):
         return float(value), True
 
     if isinstance(value, str):
@@ -116,6 +157,10 @@ def to_float(value: Any, default: float = 0.0) -> tuple[float, bool]:
 
 def to_list(value: Any) -> list:
     """Convert any value to list"""
+    # An actual list is the common case, so it is checked first
+    if type(value) is list:
+        return value
+
     if value is None:
         return []
 
@@ -130,38 +175,58 @@ def to_list(value: Any) -> list:
             return [item.strip() for item in value.split(",")]
         return []
 
-    if isinstance(value, dict | set | tuple):
-        return list(value)
+    if isinstance(value, (dict, set, tuple)):
+        return [*value]
 
     return [value]
 
 
+def _convert_to_list(value: Any) -> tuple[list, bool]:
+    return to_list(value), True
+
+
+# Converters for the non-generic target types, looked up by exact type
+_CONVERTERS: dict[type, Callable[[Any], tuple[Any, bool]]] = {
+    bool: to_bool,
+    int: to_int,
+    float: to_float,
+    str: to_string,
+    list: _convert_to_list,
+}
+
+
+@functools.cache
+def _split_hint(target_type: Any) -> tuple[Any, tuple[Any, ...]]:
+    """get_origin and get_args of a type hint, computed once per hint"""
+    return get_origin(target_type), get_args(target_type)
+
+
 def _convert_value(value: Any, target_type: Any) -> tuple[Any | None, bool]:
-    origin = get_origin(target_type)
-    args = get_args(target_type)
+    origin, args = _split_hint(target_type)
 
+    # Instances of the target type, subclasses included (e.g. a str-mixin Enum for str), are kept as they are
     if len(args) == 0 and isinstance(value, target_type):
         return value, True
+
+    converter = _CONVERTERS.get(target_type)
+    if converter is not None:
+        return converter(value)
+
     if target_type is type(None):
         if value is None:
             return None, True
         return value, False
 
-    elif target_type is bool:
-        return to_bool(value)
-    elif target_type is int:
-        return to_int(value)
-    elif target_type is float:
-        return to_float(value)
-    elif target_type is str:
-        return to_string(value)
-    elif target_type is list or origin is list:
+    elif origin is list:
         # Convert to list first
         base_list = to_list(value)
 
         # If it's a generic list type with arguments, also convert each element
-        if origin is list and args and len(args) > 0:
+        if args:
             element_type = args[0]
+            # Elements that already have exactly the element type need no conversion, so keep the list as is
+            if isinstance(element_type, type) and all(type(item) is element_type for item in base_list):
+                return base_list, True
             # return [converted[0] for item in base_list if (converted := _convert_value(item, element_type))[1]], True
             generic_list = []
             for item in base_list:
@@ -194,6 +259,67 @@ def _convert_value(value: Any, target_type: Any) -> tuple[Any | None, bool]:
         return None, False
 
 
+@functools.cache
+def _init_params(cls: type) -> tuple[tuple[str, Any], ...]:
+    """(name, type hint) of each constructor parameter of cls, computed once per class"""
+    type_hints = get_type_hints(cls.__init__)
+    return tuple((name, type_hints.get(name, Any)) for name in signature(cls).parameters if name != "self")
+
+
+@functools.cache
+def _make_coercer(cls: type[T]) -> Callable[[dict], T]:
+    """
+    Generate a function that builds a cls instance from a dict, specialized for the parameters of cls.
+
+    The parameter names and type hints are baked into the generated source, so a coercion is a
+    straight sequence of lookups and conversions instead of a loop over the class signature.
+    When every parameter is present the constructor is called positionally, which skips keyword binding.
+    """
+    params = _init_params(cls)
+    kinds = {name: param.kind for name, param in signature(cls).parameters.items()}
+    positional = all(kinds[name] is Parameter.POSITIONAL_OR_KEYWORD for name, _ in params)
+
+    lines = ["def coerce(data):", "    data_get = data.get"]
+    namespace: dict[str, Any] = {"cls": cls, "convert": _convert_value, "missing": _MISSING}
+    for index, (name, expected_type) in enumerate(params):
+        hint = f"hint_{index}"
+        namespace[hint] = expected_type
+        lines += [
+            f"    raw_value = data_get({name!r}, missing)",
+            "    if raw_value is missing:",
+            f"        v_{index} = missing",
+        ]
+        # A value that already is an instance of the hinted (non-generic) type is used as is, like _convert_value does
+        if get_origin(expected_type) is None and isinstance(expected_type, type):
+            lines += [
+                f"    elif isinstance(raw_value, {hint}):",
+                f"        v_{index} = raw_value",
+            ]
+        lines += [
+            "    else:",
+            f"        v_{index}, is_success = convert(raw_value, {hint})",
+            "        if not is_success:",
+            f'            raise TypeError(f"Cannot convert {{raw_value}} to {{{hint}}}")',
+        ]
+    values = [f"v_{index}" for index in range(len(params))]
+    if positional and values:
+        all_present = " and ".join(f"{value} is not missing" for value in values)
+        lines += [f"    if {all_present}:", f"        return cls({', '.join(values)})"]
+    items = ", ".join(f"({name!r}, v_{index})" for index, (name, _) in enumerate(params))
+    lines.append(f"    return cls(**{{name: value for name, value in [{items}] if value is not missing}})")
+    exec("\n".join(lines) + "\n", namespace)
+    return namespace["coerce"]
+
+
+def prewarm_coercers(*classes: type) -> None:
+    """
+    Resolve the type hints and generate the coercers of the given classes ahead of time.
+    Call it right after defining a class that will be coerced, so the first coercion doesn't pay for it.
+    """
+    for cls in classes:
+        _make_coercer(cls)
+
+
 def coerce_to_instance(data: dict | None | Any, cls: type[T], allow_none: bool = False) -> T | None:
     """
     Coerces the given data into an instance of the specified class.
@@ -215,25 +341,11 @@ def coerce_to_instance(data: dict | None | Any, cls: type[T], allow_none: bool =
         TypeError: If `data` is not an instance of `cls`, not a dictionary, or None when
         `allow_none` is False.
     """
-    if data is None:
-        return None if allow_none else cls()
+    # Already the right type is the common case, so it costs a single isinstance check
     if isinstance(data, cls):
         return data
+    if data is None:
+        return None if allow_none else cls()
     if isinstance(data, dict):
-        sig = signature(cls)
-        type_hints = get_type_hints(cls.__init__)
-        filtered = {}
-
-        for k, _ in sig.parameters.items():
-            if k == "self":
-                continue
-            if k in data:
-                raw_value = data[k]
-                expected_type = type_hints.get(k, Any)
-                converted_value, is_success = _convert_value(raw_value, expected_type)
-                if not is_success:
-                    raise TypeError(f"Cannot convert {raw_value} to {expected_type}")
-                filtered[k] = converted_value
-
-        return cls(**filtered)
+        return _make_coercer(cls)(data)
     raise TypeError(f"Unsupported type for coercion: {type(data)}")
@@ -61,6 +61,35 @@ def test_config_get_nested_case_insensitive(config_instance):
     assert config_instance.get("Database.Pool_Size") == "5"
 
 
+def test_get_bool(config_instance):
+    """Test get_bool parses boolean spellings and falls back to the default"""
+    assert config_instance.get_bool("server.debug") is True
+    assert config_instance.get_bool("feature_flags.beta_features") is False
+
+    config = Config({"a": "Yes", "b": " off ", "c": "1", "d": "0", "e": "maybe"})
+    assert config.get_bool("a") is True
+    assert config.get_bool("b") is False
+    assert config.get_bool("c") is True
+    assert config.get_bool("d") is False
+    assert config.get_bool("e") is False
+    assert config.get_bool("e", default=True) is True
+    assert config.get_bool("missing", default=True) is True
+
+
+def test_compile_getter(config_instance):
+    """Test compiled getters match get for nested, missing and non-dict paths"""
+    assert config_instance.compile_getter("SERVER.HOST")() == "localhost"
+    assert config_instance.compile_getter("log_level")() == "info"
+    assert config_instance.compile_getter("empty_value", "default")() is None
+    assert config_instance.compile_getter("server.non_existent", "default")() == "default"
+    assert config_instance.compile_getter("log_level.nested", "default")() == "default"
+    assert config_instance.compile_getter("empty_value.nested", "default")() == "default"
+    assert config_instance.compile_getter("")() is config_instance.get()
+
+    # Keys are embedded safely in the generated code
+    assert Config({"it's": {"a]b": "ok"}}).compile_getter("it's.a]b")() == "ok"
+
+
 def test_get_section(config_instance):
     """Test get_section method"""
     server_section = config_instance.get_section("server")
@@ -94,6 +123,13 @@ def test_attribute_access(config_instance):
     assert config_instance.Server.Host == "localhost"
 
 
+def test_section_wrappers_are_reused(config_instance):
+    """Test that nested sections are wrapped once and shared across accesses"""
+    assert config_instance.server is config_instance.server
+    assert config_instance.get_section("SERVER") is config_instance.server
+    assert config_instance.get("server") is config_instance.server.get()
+
+
 def test_item_access(config_instance):
     """Test item access syntax"""
     assert config_instance["log_level"] == "info"
@@ -122,6 +158,27 @@ def test_config_builder_with_dict():
     assert config.get("null_value") is None
 
 
+def test_config_builder_with_dict_resolves_case_collisions_before_merging():
+    """Test that keys colliding after lowercasing resolve within one dict (last wins) before it is merged"""
+    config = ConfigBuilder().with_dict({"a": {"y": 1}}).with_dict({"a": "s", "A": {"x": 1}}).build()
+    assert config.get("a") == {"y": "1", "x": "1"}
+
+    config = ConfigBuilder().with_dict({"a": {"y": 1}}).with_dict({"A": {"x": 1}, "a": {"z": 1}}).build()
+    assert config.get("a") == {"y": "1", "z": "1"}
+
+
+def test_config_builder_with_dict_ignores_colliding_sections_that_normalize_to_empty():
+    """Test that a later case-colliding section with nothing left after normalization doesn't drop the earlier one"""
+    config = ConfigBuilder().with_dict({"A": {"x": 1}, "a": {"f": lambda: None}}).build()
+    assert config.get("a") == {"x": "1"}
+
+    config = ConfigBuilder().with_dict({"a": "s", "A": {"f": lambda: None}}).build()
+    assert config.get("a") == "s"
+
+    config = ConfigBuilder().with_dict({"A": {"f": lambda: None}, "a": {"x": 1}}).build()
+    assert config.get("a") == {"x": "1"}
+
+
 def test_config_builder_with_env(monkeypatch):
     """Test with_env method of ConfigBuilder"""
     # Set environment variables
@@ -140,6 +197,38 @@ def test_config_builder_with_env(monkeypatch):
     assert config.get("debug") == "true"
 
 
+def test_config_builder_with_env_prefix(monkeypatch):
+    """Test with_env only picks up prefixed variables and strips the prefix"""
+    monkeypatch.setenv("FINCHIE__SERVER__HOST", "prefixed-host")
+    monkeypatch.setenv("FINCHIE__DEBUG", "true")
+    monkeypatch.setenv("SERVER__PORT", "9000")
+
+    config = ConfigBuilder().with_env(prefix="FINCHIE__").build()
+
+    assert config.get("server.host") == "prefixed-host"
+    assert config.get("debug") == "true"
+    assert config.get("server.port") is None
+
+    # The prefix can also be configured through FINCHIE_ENV_PREFIX
+    monkeypatch.setenv("FINCHIE_ENV_PREFIX", "finchie__")
+    config = ConfigBuilder().with_env().build()
+
+    assert config.get("server.host") == "prefixed-host"
+    assert config.get("server.port") is None
+
+
+def test_config_builder_with_env_reads_current_environment(monkeypatch):
+    """Test with_env builds independent configs and picks up environment changes"""
+    monkeypatch.setenv("SERVER__HOST", "first-host")
+
+    first = ConfigBuilder().with_env().build()
+    first.get("server")["host"] = "mutated"
+    assert ConfigBuilder().with_env().build().get("server.host") == "first-host"
+
+    monkeypatch.setenv("SERVER__HOST", "second-host")
+    assert ConfigBuilder().with_env().build().get("server.host") == "second-host"
+
+
 def test_config_builder_with_py_file(tmp_path):
     """Test with_py_file method of ConfigBuilder"""
     # Create test Python config file
@@ -360,6 +449,34 @@ def test_config_builder_with_json_file(tmp_path):
         builder.with_json_file(str(invalid_json_file))
 
 
+def test_config_builder_with_json_file_keeps_keys_inside_lists(tmp_path):
+    """Test that only object keys are lowercased, not the keys of objects inside lists"""
+    config_file = tmp_path / "list_config.json"
+    config_file.write_text(json.dumps({"Section": {"Items": [{"Name": "A"}]}}))
+
+    config = ConfigBuilder().with_json_file(str(config_file)).build()
+
+    assert config.get("section.items") == "[{'Name': 'A'}]"
+
+
+def test_config_builder_with_json_file_reloads_changed_file(tmp_path):
+    """Test that with_json_file picks up changes to a previously loaded file"""
+    config_file = tmp_path / "cached_config.json"
+    config_file.write_text(json.dumps({"server": {"host": "first-host"}}))
+
+    config = ConfigBuilder().with_json_file(str(config_file)).build()
+    assert config.get("server.host") == "first-host"
+
+    # Mutating a built config must not leak into the cached file contents
+    config.get("server")["host"] = "mutated"
+    config = ConfigBuilder().with_json_file(str(config_file)).build()
+    assert config.get("server.host") == "first-host"
+
+    config_file.write_text(json.dumps({"server": {"host": "second-host-changed"}}))
+    config = ConfigBuilder().with_json_file(str(config_file)).build()
+    assert config.get("server.host") == "second-host-changed"
+
+
 def test_config_builder_default_builder(monkeypatch, tmp_path):
     """Test get_default_builder method of Config with Python file support"""
     # Set test environment
@@ -408,3 +525,25 @@ ANOTHER_SETTING = "from-python"
     assert config.get("extra") == "value"  # From environment variable
     assert config.get("null_value") is None  # From env-specific JSON file
     assert config.get("another_setting") == "from-python"  # From Python file
+
+
+def test_config_builder_build_transfers_ownership():
+    """Test that build moves the data into the Config and resets the builder"""
+    builder = ConfigBuilder().with_dict({"SERVER": {"HOST": "localhost"}})
+
+    config = builder.build()
+    assert config.get("server.host") == "localhost"
+
+    # The builder is reset after an ownership-transferring build
+    assert builder.build().get("server.host") is None
+
+
+def test_config_builder_build_with_copy():
+    """Test that build(copy=True) leaves the builder intact and isolated"""
+    builder = ConfigBuilder().with_dict({"SERVER": {"HOST": "localhost"}})
+
+    config = builder.build(copy=True)
+    builder.with_dict({"SERVER": {"HOST": "other-host"}})
+
+    assert config.get("server.host") == "localhost"
+    assert builder.build().get("server.host") == "other-host"
@@ -1,17 +1,36 @@
+import importlib
+import os
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from typing import ClassVar
+from unittest.mock import patch
 
 import pytest
 
 from finchie_statement_fetcher.dispatcher import (
+    FETCHER_SPECS,
+    PROCESSOR_SPECS,
+    STORER_SPECS,
+    _existing_paths,
     _extract_document,
     _fetch_data,
+    _is_disabled,
+    _list_file_names,
+    _load_class,
     _process_fetched_dirs,
+    _resolve_processors,
+    _store_data,
     process,
 )
-from finchie_statement_fetcher.models import Statement
-from finchie_statement_fetcher.processor import BaseProcessor
+from finchie_statement_fetcher.processor import BaseProcessor, ProbeResult
+from finchie_statement_fetcher.storer import BaseStorer
+
+
+class FakeStatement:
+    """Lightweight stand-in for a Statement; tests only check identity"""
+
+    __slots__ = ()
 
 
 class MockExtractor(BaseProcessor):
@@ -22,11 +41,13 @@ class MockExtractor(BaseProcessor):
         return "mock_extractor"
 
     @classmethod
-    def can_handle(cls, config, folder_path) -> bool:
-        return getattr(cls._thread_local, "can_handle_result", False)
+    def probe(cls, config, folder_path, file_names):
+        if getattr(cls._thread_local, "can_handle_result", False):
+            return ProbeResult(folder_path=folder_path)
+        return None
 
     @classmethod
-    def extract(cls, config, folder_path):
+    def extract(cls, config, probe):
         return getattr(cls._thread_local, "extract_result", None)
 
     @classmethod
@@ -40,6 +61,18 @@ class MockExtractor(BaseProcessor):
         cls._thread_local.extract_result = None
 
 
+class MockStorer(BaseStorer):
+    stored: ClassVar[list] = []
+
+    @classmethod
+    def config_name(cls) -> str:
+        return "mock_storer"
+
+    @classmethod
+    def store(cls, config, statements):
+        cls.stored.append((config, statements))
+
+
 @pytest.fixture(autouse=True)
 def reset_mock_extractor():
     MockExtractor.cleanup()
@@ -63,52 +96,63 @@ def mock_config():
     }
 
 
-@pytest.fixture
-def mock_folders():
-    return ["folder1", "folder2"]
-
-
-@patch("finchie_statement_fetcher.dispatcher.fetch_gmail_messages")
+@patch("finchie_statement_fetcher.fetcher.gmail.iter_gmail_messages")
 def test_extract_source(mock_gmail_fetch, mock_config):
-    """Test that _extract_source calls the gmail fetcher with correct config"""
-    mock_gmail_fetch.return_value = ["test_folder1", "test_folder2"]
-
-    result = _fetch_data(mock_config)
-
-    mock_gmail_fetch.assert_called_once()
-    assert len(result) == 2
-    assert "test_folder1" in result
-    assert "test_folder2" in result
+    """Test that _extract_source calls the gmail fetcher with correct config and passes its batches through"""
+    mock_gmail_fetch.return_value = iter([["test_folder1"], ["test_folder2"]])
+
+    result = list(_fetch_data(mock_config))
+
+    mock_gmail_fetch.assert_called_once_with(mock_config["fetcher"]["gmail"])
+    assert result == [["test_folder1"], ["test_folder2"]]
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, False),
+        (False, False),
+        ("false", False),
+        ("", False),
+        (0, False),
+        (True, True),
+        (" Yes ", True),
+        ("on", True),
+        ("t", True),
+        ("maybe", False),
+        (1, True),
+    ],
+)
+def test_is_disabled(value, expected):
+    """Test that _is_disabled accepts the to_bool spellings and treats anything else as enabled"""
+    assert _is_disabled(value) is expected
 
 
-@patch("finchie_statement_fetcher.dispatcher.Path")
-def test_extract_documents_nonexistent_folder(mock_path, mock_config, mock_folders):
+@patch("finchie_statement_fetcher.dispatcher._extract_document")
+def test_extract_documents_nonexistent_folder(mock_extract_document, mock_config, tmp_path):
     """Test that _extract_documents skips non-existent folders"""
-    # Mock Path exists to return False
-    mock_path_instance = MagicMock()
-    mock_path_instance.exists.return_value = False
-    mock_path.return_value = mock_path_instance
+    folders = [str(tmp_path / "folder1"), str(tmp_path / "folder2")]
 
-    result = _process_fetched_dirs(mock_config, mock_folders)
+    with ThreadPoolExecutor() as executor:
+        result = _process_fetched_dirs([], executor, folders)
 
     assert len(result) == 0
-    assert mock_path_instance.exists.call_count == 2
+    mock_extract_document.assert_not_called()
 
 
-@patch("finchie_statement_fetcher.dispatcher.Path")
 @patch("finchie_statement_fetcher.dispatcher._extract_document")
-def test_extract_documents_success(mock_extract_document, mock_path, mock_config, mock_folders):
+def test_extract_documents_success(mock_extract_document, mock_config, tmp_path):
     """Test that _extract_documents processes existing folders correctly"""
-    # Mock Path exists to return True
-    mock_path_instance = MagicMock()
-    mock_path_instance.exists.return_value = True
-    mock_path.return_value = mock_path_instance
+    folders = [str(tmp_path / "folder1"), str(tmp_path / "folder2")]
+    for folder in folders:
+        Path(folder).mkdir()
 
     # Mock _extract_document to return a Statement
-    mock_bill = MagicMock(spec=Statement)
+    mock_bill = FakeStatement()
     mock_extract_document.return_value = mock_bill
 
-    result = _process_fetched_dirs(mock_config, mock_folders)
+    with ThreadPoolExecutor() as executor:
+        result = _process_fetched_dirs([], executor, folders)
 
     assert len(result) == 2
     assert result[0] == mock_bill
@@ -116,21 +160,53 @@ def test_extract_documents_success(mock_extract_document, mock_path, mock_config
     assert mock_extract_document.call_count == 2
 
 
-@patch("finchie_statement_fetcher.dispatcher.ALL_PROCESSORS", [MockExtractor])
+def test_existing_paths(tmp_path, monkeypatch):
+    """Test that _existing_paths keeps only existing paths, whatever their parent"""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "b").mkdir()
+    monkeypatch.chdir(tmp_path)
+
+    paths = [str(tmp_path / "a"), str(tmp_path / "missing"), str(tmp_path / "nested" / "b"), "a", f"{tmp_path / 'a'}{os.sep}"]
+
+    assert _existing_paths(paths) == {str(tmp_path / "a"), str(tmp_path / "nested" / "b"), "a", f"{tmp_path / 'a'}{os.sep}"}
+
+
+def test_existing_paths_dot_entries(tmp_path, monkeypatch):
+    """Test that "." and paths ending in ".." count as existing, though a parent listing never contains them"""
+    (tmp_path / "a").mkdir()
+    monkeypatch.chdir(tmp_path)
+
+    paths = [".", os.path.join("a", ".."), str(tmp_path / "a" / ".."), os.path.join("missing", "..")]
+
+    assert _existing_paths(paths) == {".", os.path.join("a", ".."), str(tmp_path / "a" / "..")}
+
+
+@patch("finchie_statement_fetcher.dispatcher.PROCESSOR_SPECS", {"mock_extractor": (__name__, "MockExtractor")})
 def test_extract_document_success():
     """Test that _extract_document finds the right extractor and extracts data"""
     config = {"mock_extractor": {"test_param": "test_value"}}
     folder_path = Path("test_folder")
 
     # Set up MockExtractor to return a bill
-    mock_bill = MagicMock(spec=Statement)
+    mock_bill = FakeStatement()
     MockExtractor.set_state(can_handle_result=True, extract_result=mock_bill)
-    result = _extract_document(config, folder_path)
+    result = _extract_document(_resolve_processors(config), folder_path)
 
     assert result == mock_bill
 
 
-@patch("finchie_statement_fetcher.dispatcher.ALL_PROCESSORS", [MockExtractor])
+def test_list_file_names(tmp_path):
+    """Test that _list_file_names lists top-level entries and tolerates missing folders"""
+    (tmp_path / "statement.pdf").write_bytes(b"")
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "inner.pdf").write_bytes(b"")
+
+    assert _list_file_names(tmp_path) == frozenset({"statement.pdf", "nested"})
+    assert _list_file_names(tmp_path / "missing") == frozenset()
+
+
+@patch("finchie_statement_fetcher.dispatcher.PROCESSOR_SPECS", {"mock_extractor": (__name__, "MockExtractor")})
 def test_extract_document_no_handler():
     """Test that _extract_document returns None when no extractor can handle the folder"""
     config = {"mock_extractor": {}}
@@ -138,12 +214,12 @@ def test_extract_document_no_handler():
 
     # Set up MockExtractor to not handle any folders
     MockExtractor.set_state(can_handle_result=False, extract_result=None)
-    result = _extract_document(config, folder_path)
+    result = _extract_document(_resolve_processors(config), folder_path)
 
     assert result is None
 
 
-@patch("finchie_statement_fetcher.dispatcher.ALL_PROCESSORS", [MockExtractor])
+@patch("finchie_statement_fetcher.dispatcher.PROCESSOR_SPECS", {"mock_extractor": (__name__, "MockExtractor")})
 def test_extract_document_extract_failure():
     """Test that _extract_document tries all extractors and returns None when extraction fails"""
     config = {"mock_extractor": {}}
@@ -151,19 +227,74 @@ def test_extract_document_extract_failure():
 
     # Set up MockExtractor to handle folders but fail to extract
     MockExtractor.set_state(can_handle_result=True, extract_result=None)
-    result = _extract_document(config, folder_path)
+    result = _extract_document(_resolve_processors(config), folder_path)
 
     assert result is None
 
 
+@patch(
+    "finchie_statement_fetcher.dispatcher.PROCESSOR_SPECS",
+    {"tsib": ("finchie_statement_fetcher.processor.tsib", "TsibProcessor"), "mock_extractor": (__name__, "MockExtractor")},
+)
+def test_resolve_processors_puts_configured_first():
+    """Test that processors named in the config are probed before the others"""
+    processors = _resolve_processors({"mock_extractor": {"test_param": "test_value"}})
+
+    assert [processor_cls.config_name() for processor_cls, _ in processors] == ["mock_extractor", "tsib"]
+    assert processors[0][1] == {"test_param": "test_value"}
+    assert processors[1][1] == {}
+
+
+@pytest.mark.parametrize(("config_name", "module_name", "class_name"), [(name, *spec) for name, spec in PROCESSOR_SPECS.items()])
+def test_processor_specs_resolve(config_name, module_name, class_name):
+    """Test that every registered processor spec imports a matching processor class"""
+    processor_cls = _load_class(module_name, class_name)
+
+    assert issubclass(processor_cls, BaseProcessor)
+    assert processor_cls.config_name() == config_name
+
+
+@pytest.mark.parametrize(("config_name", "module_name", "class_name"), [(name, *spec) for name, spec in STORER_SPECS.items()])
+def test_storer_specs_resolve(config_name, module_name, class_name):
+    """Test that every registered storer spec imports a matching storer class"""
+    storer_cls = _load_class(module_name, class_name)
+
+    assert issubclass(storer_cls, BaseStorer)
+    assert storer_cls.config_name() == config_name
+
+
+@pytest.mark.parametrize(("source", "module_name", "function_name"), [(name, *spec) for name, spec in FETCHER_SPECS.items()])
+def test_fetcher_specs_resolve(source, module_name, function_name):
+    """Test that every registered fetcher spec points at an importable function"""
+    assert callable(getattr(importlib.import_module(module_name), function_name))
+
+
 @patch("finchie_statement_fetcher.dispatcher._fetch_data")
 @patch("finchie_statement_fetcher.dispatcher._process_fetched_dirs")
-def test_process(mock_process_fetched_dirs, mock_fetch_data, mock_config):
-    """Test that process calls the extract functions with correct params"""
-    mock_fetch_data.return_value = ["test_folder1", "test_folder2"]
-    mock_process_fetched_dirs.return_value = [MagicMock(spec=Statement)]
+@patch("finchie_statement_fetcher.dispatcher._resolve_processors")
+def test_process(mock_resolve_processors, mock_process_fetched_dirs, mock_fetch_data, mock_config):
+    """Test that process resolves processors once and processes every fetched batch with them on one pool"""
+    # _fetch_data is a generator
+    mock_fetch_data.return_value = (batch for batch in [["test_folder1", "test_folder2"], ["test_folder3"]])
+    mock_process_fetched_dirs.return_value = [FakeStatement()]
 
     process(mock_config)
 
     mock_fetch_data.assert_called_once_with(mock_config)
-    mock_process_fetched_dirs.assert_called_once_with(mock_config, ["test_folder1", "test_folder2"])
+    mock_resolve_processors.assert_called_once_with(mock_config["document_processor"])
+    processors = mock_resolve_processors.return_value
+    batches = [call.args for call in mock_process_fetched_dirs.call_args_list]
+    assert [(args[0], args[2]) for args in batches] == [(processors, ["test_folder1", "test_folder2"]), (processors, ["test_folder3"])]
+    assert batches[0][1] is batches[1][1]
+
+
+def test_store_data_dispatches_by_name():
+    """Test that _store_data hands statements to configured storers only, skipping unknown and disabled ones"""
+    statements = [FakeStatement()]
+    config = {"storer": {"mock_storer": {"path": "out"}, "unknown": {}, "disabled": {"disable": True}}}
+    MockStorer.stored.clear()
+
+    with patch.dict("finchie_statement_fetcher.dispatcher.STORER_SPECS", {"mock_storer": (__name__, "MockStorer")}):
+        _store_data(config, statements)
+
+    assert MockStorer.stored == [({"path": "out"}, statements)]
@@ -1,15 +1,29 @@
+import base64
+import json
+import threading
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
 import pytest
 
 from finchie_statement_fetcher.fetcher import gmail
 
 # Import required members from the module
 GmailConfig = gmail.GmailConfig
-_get_header = gmail._get_header
 _get_credentials = gmail._get_credentials
 GmailExtractorError = gmail.GmailFetcherError
 fetch_gmail_messages = gmail.fetch_gmail_messages
 
 
+@pytest.fixture(autouse=True)
+def clear_credentials_cache():
+    gmail._CREDENTIALS_CACHE.clear()
+    gmail._SAVED_TOKENS.clear()
+    yield
+    gmail._CREDENTIALS_CACHE.clear()
+    gmail._SAVED_TOKENS.clear()
+
+
 def test_default_values():
     """Test if the default values of GmailConfig are correctly set"""
     config = GmailConfig()
@@ -39,18 +53,27 @@ def test_custom_values():
     assert config.days_ago == 15
 
 
-def test_get_header():
-    """Test if the _get_header function can correctly extract email headers"""
+def test_config_is_frozen():
+    """Test that GmailConfig can't be modified after creation"""
+    config = GmailConfig()
+    with pytest.raises(AttributeError):
+        config.query = "label:bill"
+
+
+def test_header_map():
+    """Test that _header_map indexes headers by lowercased name, keeping the first of repeated headers"""
     headers = [
         {"name": "From", "value": "sender@example.com"},
         {"name": "To", "value": "recipient@example.com"},
         {"name": "Subject", "value": "Test Email"},
+        {"name": "SUBJECT", "value": "Repeated"},
     ]
 
-    assert _get_header(headers, "From") == "sender@example.com"
-    assert _get_header(headers, "To") == "recipient@example.com"
-    assert _get_header(headers, "Subject") == "Test Email"
-    assert _get_header(headers, "NonExistent") == ""
+    assert gmail._header_map(headers) == {
+        "from": "sender@example.com",
+        "to": "recipient@example.com",
+        "subject": "Test Email",
+    }
 
 
 def test_get_credentials_from_file(mocker):
@@ -103,6 +126,29 @@ def test_get_credentials_from_base64_token(mocker):
     assert mock_from_authorized_user_info.called
 
 
+def test_get_credentials_reuses_fresh_credentials(mocker):
+    """Test that _get_credentials caches credentials and only reloads them when stale"""
+    mocker.patch("os.path.exists", return_value=True)
+    mock_from_authorized_user_file = mocker.patch("google.oauth2.credentials.Credentials.from_authorized_user_file")
+
+    file_credentials = mocker.MagicMock()
+    file_credentials.valid = True
+    file_credentials.expiry = datetime.now(UTC).replace(tzinfo=None) + timedelta(hours=1)
+    mock_from_authorized_user_file.return_value = file_credentials
+
+    config = GmailConfig(base64_token=None)
+    assert _get_credentials(config) is file_credentials
+    assert _get_credentials(config) is file_credentials
+    assert mock_from_authorized_user_file.call_count == 1
+
+    # Close to expiry: the cached credentials are refreshed in place
+    mocker.patch.object(gmail, "_save_token")
+    file_credentials.expiry = datetime.now(UTC).replace(tzinfo=None) + timedelta(minutes=1)
+    assert _get_credentials(config) is file_credentials
+    file_credentials.refresh.assert_called_once()
+    assert mock_from_authorized_user_file.call_count == 1
+
+
 def test_fetch_gmail_messages_authentication_error(mocker):
     """Test authentication error handling when processing messages"""
     # Patch the _get_credentials function directly
@@ -110,3 +156,234 @@ def test_fetch_gmail_messages_authentication_error(mocker):
 
     with pytest.raises(GmailExtractorError, match="Failed to obtain credentials"):
         fetch_gmail_messages(GmailConfig(query="label:inbox"))
+
+
+class FakeBatch:
+    """Minimal stand-in for googleapiclient's BatchHttpRequest"""
+
+    def __init__(self, service, callback):
+        self._service = service
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id):
+        self._requests.append((request_id, request))
+
+    def execute(self, http=None):
+        self._service.batch_sizes.append(len(self._requests))
+        for request_id, request in self._requests:
+            self._callback(request_id, request.execute(), None)
+
+
+class FakeRequest:
+    """Request stand-in whose execute() returns a fixed response"""
+
+    def __init__(self, response):
+        self._response = response
+
+    def execute(self):
+        return self._response
+
+
+def _encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+@pytest.fixture
+def fake_service(mocker):
+    """Gmail service mock with one message that has an HTML body and a PDF attachment"""
+    message = {
+        "id": "msg1",
+        "payload": {
+            "parts": [
+                {"mimeType": "text/html", "body": {"data": _encode(b"<p>bill</p>")}},
+                {
+                    "mimeType": "application/pdf",
+                    "filename": "statement.pdf",
+                    "headers": [{"name": "Content-Disposition", "value": 'attachment; filename="statement.pdf"'}],
+                    "body": {"attachmentId": "att1", "size": 3},
+                },
+            ]
+        },
+    }
+
+    service = mocker.MagicMock()
+    service.batch_sizes = []
+    service.new_batch_http_request.side_effect = lambda callback: FakeBatch(service, callback)
+    messages_api = service.users.return_value.messages.return_value
+    messages_api.list.return_value.execute.return_value = {"messages": [{"id": "msg1"}]}
+    messages_api.get.return_value.execute.return_value = message
+    messages_api.attachments.return_value.get.return_value.execute.return_value = {"data": _encode(b"pdf")}
+
+    mocker.patch.object(gmail, "_get_credentials", return_value=mocker.MagicMock())
+    mocker.patch.object(gmail, "build", return_value=service)
+    return service
+
+
+def test_fetch_gmail_messages_saves_message_and_attachments(fake_service, tmp_path):
+    """Test that messages and attachments are fetched in batches and saved to disk"""
+    folders = fetch_gmail_messages(GmailConfig(query="label:bill", output_dir=str(tmp_path)))
+
+    assert len(folders) == 1
+    msg_dir = Path(folders[0])
+    assert msg_dir.name == "msg1"
+    assert json.loads((msg_dir / "message.json").read_text(encoding="utf-8"))["id"] == "msg1"
+    assert (msg_dir / "body.html").read_text(encoding="utf-8") == "<p>bill</p>"
+    assert (msg_dir / "statement.pdf").read_bytes() == b"pdf"
+
+    # One batch for the message, one for its attachment
+    assert fake_service.batch_sizes == [1, 1]
+
+
+def test_save_message_parts_walks_nested_parts_in_order(tmp_path):
+    """Test that nested parts are walked in document order and single-part payloads save their body"""
+    payload = {
+        "mimeType": "multipart/mixed",
+        "body": {"size": 0},
+        "parts": [
+            {
+                "mimeType": "multipart/alternative",
+                "body": {"size": 0},
+                "parts": [
+                    {"mimeType": "text/plain", "body": {"data": _encode(b"bill")}},
+                    {"mimeType": "text/html", "body": {"data": _encode(b"<p>bill</p>")}},
+                ],
+            },
+            {
+                "mimeType": "application/pdf",
+                "filename": "a.pdf",
+                "headers": [{"name": "Content-Disposition", "value": "attachment"}],
+                "body": {"attachmentId": "att1", "size": 1},
+            },
+            {
+                "mimeType": "application/pdf",
+                "filename": "b.pdf",
+                "headers": [{"name": "Content-Disposition", "value": "attachment"}],
+                "body": {"attachmentId": "att2", "size": 1},
+            },
+        ],
+    }
+
+    assert gmail._save_message_parts(payload, str(tmp_path)) == [("att1", "a.pdf", 1), ("att2", "b.pdf", 1)]
+    assert (tmp_path / "body.txt").read_text(encoding="utf-8") == "bill"
+    assert (tmp_path / "body.html").read_text(encoding="utf-8") == "<p>bill</p>"
+
+    single_dir = tmp_path / "single"
+    single_dir.mkdir()
+    assert gmail._save_message_parts({"mimeType": "text/plain", "body": {"data": _encode(b"only")}}, str(single_dir)) == []
+    assert (single_dir / "body.txt").read_text(encoding="utf-8") == "only"
+
+
+@pytest.mark.parametrize(
+    ("part", "expected"),
+    [
+        ({"filename": "a.pdf", "body": {"attachmentId": "att1", "size": 1}}, ("att1", "a.pdf", 1)),
+        ({"filename": "dir/a.pdf", "body": {"attachmentId": "att1", "size": 1}}, ("att1", "a.pdf", 1)),
+        ({"filename": "", "body": {"attachmentId": "att1", "size": 1}}, None),
+        ({"filename": "smime.p7s", "mimeType": "application/pkcs7-signature", "body": {"attachmentId": "att1", "size": 1}}, None),
+        ({"filename": "a.pdf", "body": {"size": 1}}, None),
+        ({"filename": "a.pdf", "body": {"attachmentId": "att1", "size": 0}}, None),
+        ({"filename": "a.png", "disposition": "inline", "body": {"attachmentId": "att1", "size": 1}}, None),
+    ],
+)
+def test_get_attachment(part, expected):
+    """Test which parts are treated as attachments to download"""
+    part = dict(part)
+    part["headers"] = [{"name": "Content-Disposition", "value": part.pop("disposition", "attachment")}]
+    assert gmail._get_attachment(part) == expected
+
+
+def test_save_message_body_invalid_utf8(tmp_path):
+    """Test that a text body which is not valid UTF-8 is still saved"""
+    # Big5 bytes b"\xb1b\xb3\xe6": every byte that isn't valid UTF-8 becomes U+FFFD
+    gmail._save_message_body("text/plain", _encode("帳單".encode("big5")), str(tmp_path))
+    assert (tmp_path / "body.txt").read_text(encoding="utf-8") == "\ufffdb\ufffd\ufffd"
+
+    gmail._save_message_body("image/png", _encode(b"\x89PNG"), str(tmp_path))
+    assert (tmp_path / "body_raw").read_bytes() == b"\x89PNG"
+
+
+def test_fetch_gmail_messages_follows_page_tokens(fake_service, tmp_path):
+    """Test that every listing page is fetched and its messages are saved in listing order"""
+    messages_api = fake_service.users.return_value.messages.return_value
+    messages_api.list.return_value.execute.side_effect = [
+        {"messages": [{"id": "msg1"}], "nextPageToken": "page2"},
+        {"messages": [{"id": "msg2"}]},
+    ]
+    messages_api.get.side_effect = lambda **kwargs: FakeRequest({"id": kwargs["id"], "payload": {}})
+
+    folders = fetch_gmail_messages(GmailConfig(query="label:bill", output_dir=str(tmp_path)))
+
+    assert [Path(folder).name for folder in folders] == ["msg1", "msg2"]
+    page_tokens = [call.kwargs["pageToken"] for call in messages_api.list.call_args_list]
+    assert page_tokens == [None, "page2"]
+
+
+def test_iter_gmail_messages_yields_batches(fake_service, tmp_path, mocker):
+    """Test that message folders are yielded one batch at a time, in listing order"""
+    mocker.patch.object(gmail, "_BATCH_SIZE", 2)
+    messages_api = fake_service.users.return_value.messages.return_value
+    messages_api.list.return_value.execute.return_value = {"messages": [{"id": f"msg{i}"} for i in range(3)]}
+    messages_api.get.side_effect = lambda **kwargs: FakeRequest({"id": kwargs["id"], "payload": {}})
+
+    batches = list(gmail.iter_gmail_messages(GmailConfig(query="label:bill", output_dir=str(tmp_path))))
+
+    assert [[Path(folder).name for folder in batch] for batch in batches] == [["msg0", "msg1"], ["msg2"]]
+
+
+def test_iter_gmail_messages_cancels_pending_batches_on_error(fake_service, tmp_path, mocker):
+    """Test that a failing batch stops the batches that haven't started yet"""
+    mocker.patch.object(gmail, "_BATCH_SIZE", 1)
+    mocker.patch.object(gmail, "_MAX_CONCURRENT_BATCHES", 1)
+    messages_api = fake_service.users.return_value.messages.return_value
+    messages_api.list.return_value.execute.return_value = {"messages": [{"id": f"msg{i}"} for i in range(12)]}
+
+    shutdown = threading.Event()
+    original_shutdown = gmail.ThreadPoolExecutor.shutdown
+
+    def record_shutdown(self, *args, **kwargs):
+        shutdown.set()
+        original_shutdown(self, *args, **kwargs)
+
+    mocker.patch.object(gmail.ThreadPoolExecutor, "shutdown", record_shutdown)
+
+    started = []
+
+    def save_batch(service, creds, msg_ids, base_dir):
+        started.append(msg_ids[0])
+        if msg_ids[0] == "msg0":
+            raise RuntimeError("batch failed")
+        # Hold the single worker until the error has been handled, so no batch slips in before the cancel
+        shutdown.wait(timeout=5)
+        return []
+
+    mocker.patch.object(gmail, "_save_message_batch", side_effect=save_batch)
+
+    with pytest.raises(RuntimeError, match="batch failed"):
+        list(gmail.iter_gmail_messages(GmailConfig(query="label:bill", output_dir=str(tmp_path))))
+
+    # At most the batch that was already running when msg0 failed; the other ten were cancelled
+    assert started[0] == "msg0"
+    assert len(started) <= 2
+
+
+def test_save_message_batch_http_has_timeout(tmp_path, mocker):
+    """Test that each batch's own Http keeps the API client's default socket timeout"""
+    authorized_http = mocker.patch.object(gmail, "AuthorizedHttp")
+    mocker.patch.object(gmail, "_fetch_messages", return_value={"msg1": {"payload": {}}})
+    mocker.patch.object(gmail, "_save_attachments")
+
+    gmail._save_message_batch(mocker.MagicMock(), mocker.MagicMock(), ["msg1"], str(tmp_path))
+
+    assert authorized_http.call_args.kwargs["http"].timeout == 60
+
+
+def test_save_attachments_caps_batch_size_by_bytes(fake_service, tmp_path, mocker):
+    """Test that attachment batches are split once their reported size exceeds the cap"""
+    mocker.patch.object(gmail, "_MAX_BATCH_ATTACHMENT_BYTES", 10)
+    downloads = [("msg1", f"att{i}", str(tmp_path / f"{i}.pdf"), size) for i, size in enumerate([4, 4, 4, 20, 1])]
+
+    gmail._save_attachments(fake_service, downloads)
+
+    assert fake_service.batch_sizes == [2, 1, 1, 1]
+    assert (tmp_path / "3.pdf").read_bytes() == b"pdf"
@@ -1,11 +1,17 @@
 from dataclasses import dataclass
+from enum import Enum
 
 import pytest
 
+from common import config
 from finchie_statement_fetcher.utils.type_utils import (
+    _BOOL_STRINGS,
     _convert_value,
+    _make_coercer,
     coerce_to_instance,
     get_value,
+    parse_bool_string,
+    prewarm_coercers,
     to_bool,
     to_float,
     to_int,
@@ -91,8 +97,19 @@ class TestToBool:
         assert to_bool("no") == (False, True)
         assert to_bool("N") == (False, True)
         assert to_bool("0") == (False, True)
+        assert to_bool("On") == (True, True)
+        assert to_bool("off") == (False, True)
+        assert to_bool("T") == (True, True)
+        assert to_bool("f") == (False, True)
         assert to_bool("invalid") == (False, False)
 
+    def test_spellings_match_config_get_bool(self):
+        for spelling, expected in config._BOOL_STRINGS.items():
+            assert parse_bool_string(spelling) is expected
+            assert parse_bool_string(f" {spelling.upper()} ") is expected
+        assert set(config._BOOL_STRINGS) == set(_BOOL_STRINGS)
+        assert parse_bool_string("maybe") is None
+
     def test_string_with_whitespace(self):
         assert to_bool(" true ") == (True, True)
         assert to_bool(" false ") == (False, True)
@@ -138,6 +155,7 @@ class TestToInt:
     def test_other_values(self):
         assert to_int(True) == (1, True)
         assert to_int(False) == (0, True)
+        assert type(to_int(True)[0]) is int
         assert to_int([]) == (0, False)
         assert to_int({}) == (0, False)
 
@@ -246,6 +264,40 @@ class TestCoerceToInstance:
         with pytest.raises(TypeError):
             coerce_to_instance("invalid", self.Person)
 
+    def test_invalid_field_value(self):
+        with pytest.raises(TypeError, match="Cannot convert abc"):
+            coerce_to_instance({"name": "John", "age": "abc"}, self.Person)
+
+    def test_partial_and_keyword_only_data(self):
+        @dataclass(kw_only=True)
+        class Options:
+            retries: int = 3
+            label: str = ""
+
+        assert coerce_to_instance({"name": "John", "age": "30"}, self.Person) == self.Person(name="John", age=30)
+        assert coerce_to_instance({"retries": "5"}, Options) == Options(retries=5)
+
+    def test_subclass_field_values_are_kept(self):
+        class Color(str, Enum):  # noqa: UP042 - a plain str mixin, like the enums this must not stringify
+            RED = "red"
+
+        person = coerce_to_instance({"name": Color.RED, "age": True}, self.Person)
+        assert person.name is Color.RED
+        assert person.age is True
+
+    def test_coercer_is_generated_once_per_class(self):
+        assert _make_coercer(self.Person) is _make_coercer(self.Person)
+
+    def test_prewarm_coercers(self):
+        @dataclass
+        class Settings:
+            value: int = 0
+
+        prewarm_coercers(Settings)
+        hits = _make_coercer.cache_info().hits
+        assert coerce_to_instance({"value": "1"}, Settings) == Settings(value=1)
+        assert _make_coercer.cache_info().hits == hits + 1
+
     def test_coerce_basic_types(self):
         assert coerce_to_instance(42, int) == 42  # 已經是正確類型的實例
 
@@ -338,6 +390,14 @@ class TestConvertValue:
         assert _convert_value(True, str) == ("True", True)
         assert _convert_value(None, str) == ("", False)
 
+    def test_convert_keeps_subclass_instances(self):
+        class Color(str, Enum):  # noqa: UP042 - a plain str mixin, like the enums this must not stringify
+            RED = "red"
+
+        converted, is_success = _convert_value(Color.RED, str)
+        assert is_success
+        assert converted is Color.RED
+
     def test_convert_to_list(self):
         assert _convert_value("abc", list) == (["abc"], True)
         assert _convert_value([1, 2, 3], list) == ([1, 2, 3], True)
@@ -346,6 +406,10 @@ class TestConvertValue:
     def test_convert_to_typed_list(self):
         assert _convert_value(["1", "2", "3"], list[int]) == ([1, 2, 3], True)
         assert _convert_value([1, 2, 3], list[str]) == (["1", "2", "3"], True)
+        assert _convert_value([True, 2], list[int]) == ([1, 2], True)
+
+        already_typed = [1, 2, 3]
+        assert _convert_value(already_typed, list[int])[0] is already_typed
 
     def test_convert_to_union_type(self):
         assert _convert_value("42", int | str) == ("42", True)